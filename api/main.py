@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from contextlib import asynccontextmanager
 from datetime import datetime
+import asyncio
 import time
 from typing import List
 
@@ -16,20 +17,58 @@ from services.cache import cache
 from services.price_service import price_service
 from services.news_service import news_service
 from services.sentiment_service import sentiment_service
+from services.sentiment_cache import sentiment_cache
+from services.rolling_sentiment import rolling_sentiment
+from services.sentiment_history import sentiment_history
+from services.inference_client import inference_client
+from services.inference_executor import inference_executor, InferenceRejected, InferenceTimeout
 from services.alert_service import alert_service
+from utils.memory import process_memory
 
 settings = get_settings()
 
+async def preload_sentiment_model():
+    '''Load and warm up FinBERT off the event loop; /health is not ready until done.'''
+    try:
+        await inference_executor.run(
+            sentiment_service.preload,
+            settings.sentiment_warmup_batch_sizes,
+            timeout=settings.model_load_timeout_seconds
+        )
+    except InferenceTimeout:
+        # The load keeps running on its thread and marks the service ready
+        # when it finishes; until then /health keeps reporting 'starting'
+        print(f' Sentiment model still loading after {settings.model_load_timeout_seconds:.0f}s')
+        return
+    except Exception as e:
+        # Warmup failed or the pool rejected the call: serve with whatever loaded
+        print(f' Sentiment preload error: {e}')
+        sentiment_service.ready = True
+    print(f' Sentiment model ready ({sentiment_service.model_id})')
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print(' Starting Sentiment Market Alerts API...')
     create_tables()
     await cache.connect()
+    sentiment_history.start()
+    preload_task = None
+    # With a standalone inference server the API holds no model of its own
+    if settings.sentiment_preload and not inference_client.enabled:
+        sentiment_service.ready = False
+        preload_task = asyncio.create_task(preload_sentiment_model())
     print(' Application started!')
     print(f' API Docs: http://localhost:8000/docs')
     print(f' Web UI: http://localhost:8000/ui')
     yield
     print('Shutting down...')
+    if preload_task and not preload_task.done():
+        preload_task.cancel()
+    await sentiment_service.batcher.stop()
+    await inference_client.close()
+    inference_executor.shutdown()
+    await sentiment_history.stop()
+    await news_service.close()
     await cache.close()
 
 app = FastAPI(
@@ -69,6 +108,7 @@ async def root():
         'ui': '/ui',
         'endpoints': {
             'health': '/health',
+            'metrics': '/api/v1/metrics',
             'stock_data': '/api/v1/stocks/{ticker}',
             'news': '/api/v1/news/{ticker}',
             'alerts': '/api/v1/alerts/{ticker}',
@@ -91,17 +131,38 @@ async def health_check():
     except:
         cache_healthy = False
     
-    return {
-        'status': 'healthy',
+    body = {
+        'status': 'healthy' if sentiment_service.ready else 'starting',
         'timestamp': time.time(),
         'checks': {
             'cache': 'healthy' if cache_healthy else 'degraded',
-            'database': 'healthy'
+            'database': 'healthy',
+            'sentiment_model': sentiment_service.model_id if sentiment_service.ready else 'loading'
         }
     }
+    
+    # Keep load balancers away until the model is warm
+    if not sentiment_service.ready:
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+@app.get('/api/v1/metrics')
+async def get_metrics():
+    return {
+        'timestamp': time.time(),
+        'sentiment_model': sentiment_service.model_id,
+        'sentiment_cache': sentiment_cache.stats(),
+        'sentiment_history': sentiment_history.stats(),
+        'news_feeds': news_service.stats(),
+        'inference_queue': sentiment_service.batcher.stats(),
+        'inference_executor': inference_executor.stats(),
+        'cascade': sentiment_service.cascade_stats(),
+        'inference_server': inference_client.stats() if inference_client.enabled else None,
+        'process_memory': process_memory()
+    }
 
 @app.get('/api/v1/stocks/{ticker}')
-async def get_stock(ticker: str):
+async def get_stock(ticker: str, include_summaries: bool = False):
     ticker = ticker.upper()
     cache_key = cache.price_key(ticker)
     cached = await cache.get(cache_key)
@@ -120,13 +181,16 @@ async def get_stock(ticker: str):
     try:
         articles = await news_service.get_news_for_ticker(ticker, hours=24)
         if articles and len(articles) >= 3:
-            headlines = [a['headline'] for a in articles[:10]]
-            sentiments = sentiment_service.analyze_batch(headlines)
+            sentiments = await sentiment_service.analyze_articles(articles[:10], include_summaries)
             aggregated = sentiment_service.aggregate_sentiment(sentiments)
+            await rolling_sentiment.update(ticker, articles[:10], sentiments)
+            sentiment_history.record(ticker, articles[:10], sentiments)
+            rolling = await rolling_sentiment.read(ticker)
             
             sentiment_data = {
                 'overall_sentiment': aggregated['overall_sentiment'],
                 'score': aggregated['overall_score'],
+                'decayed_score': rolling['score'] if rolling else None,
                 'article_count': len(articles),
                 'positive_count': aggregated['positive_count'],
                 'negative_count': aggregated['negative_count'],
@@ -136,6 +200,17 @@ async def get_stock(ticker: str):
                     for s in sentiments[:5]
                 ]
             }
+    except (InferenceRejected, InferenceTimeout) as e:
+        # Inference is overloaded - tell the client to back off
+        return JSONResponse(
+            status_code=503,
+            content={
+                'error': 'INFERENCE_UNAVAILABLE',
+                'message': str(e),
+                'ticker': ticker
+            },
+            headers={'Retry-After': '1'}
+        )
     except Exception as e:
         print(f'Sentiment error for {ticker}: {e}')
     
@@ -160,14 +235,14 @@ async def get_news(ticker: str, hours: int = 24):
     }
 
 @app.get('/api/v1/alerts/{ticker}')
-async def check_alert(ticker: str, hours: int = 1):
+async def check_alert(ticker: str, hours: int = 1, include_summaries: bool = False):
     """
     Check for divergence alert with proper error handling.
     """
     ticker = ticker.upper()
     
     try:
-        alert = await alert_service.detect_divergence(ticker, hours)
+        alert = await alert_service.detect_divergence(ticker, hours, include_summaries)
         
         if not alert:
             # Return 404 with proper JSON response
@@ -183,6 +258,18 @@ async def check_alert(ticker: str, hours: int = 1):
         
         return alert
         
+    except (InferenceRejected, InferenceTimeout) as e:
+        # Inference is overloaded - tell the client to back off
+        return JSONResponse(
+            status_code=503,
+            content={
+                'error': 'INFERENCE_UNAVAILABLE',
+                'message': str(e),
+                'ticker': ticker
+            },
+            headers={'Retry-After': '1'}
+        )
+        
     except Exception as e:
         print(f'Error in check_alert: {e}')
         import traceback
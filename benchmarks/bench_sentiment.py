@@ -0,0 +1,194 @@
+"""
+Sentiment scoring benchmarks (offline).
+
+Usage:
+    python -m benchmarks.bench_sentiment --output bench.json
+    python -m benchmarks.bench_sentiment --tiny --repeats 5
+    python -m benchmarks.bench_sentiment --model-path artifacts/finbert --compare bench.json
+
+Reports headlines/second and p50/p95/p99 latency for analyze_sentiment,
+analyze_batch (batch sizes 1-128) and _rule_based_sentiment. No network is
+needed: by default the model is a randomly initialized BERT with FinBERT's
+shape (bert-base, 3 labels) and a tokenizer built from the sample headlines,
+so timings are representative even though the scores are meaningless.
+Results are written as JSON so runs can be compared between commits.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from services.sentiment_service import SentimentService
+from utils.headlines import SAMPLE_HEADLINES
+
+BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64, 128]
+
+
+def build_stub_model(tiny: bool = False):
+    '''Randomly initialized BERT classifier + word-level tokenizer (no downloads).'''
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    words = sorted({w for h in SAMPLE_HEADLINES for w in h.lower().replace(',', ' ').split()})
+    vocab = ['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]'] + words
+
+    vocab_dir = tempfile.mkdtemp(prefix='bench-vocab-')
+    vocab_file = os.path.join(vocab_dir, 'vocab.txt')
+    with open(vocab_file, 'w') as f:
+        f.write('\n'.join(vocab))
+    tokenizer = BertTokenizerFast(vocab_file=vocab_file)
+
+    if tiny:
+        config = BertConfig(vocab_size=len(vocab), hidden_size=128, num_hidden_layers=2,
+                            num_attention_heads=2, intermediate_size=512, num_labels=3)
+    else:
+        # FinBERT is bert-base: 12 layers, 768 hidden, 12 heads (vocab size barely matters)
+        config = BertConfig(vocab_size=len(vocab), num_labels=3)
+
+    torch.manual_seed(0)
+    model = BertForSequenceClassification(config)
+    model.eval()
+    return tokenizer, model
+
+
+def make_service(args) -> SentimentService:
+    '''SentimentService with a local or stub torch model already installed.'''
+    service = SentimentService()
+    service.backend = 'torch'
+
+    if args.model_path:
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        service.tokenizer = AutoTokenizer.from_pretrained(args.model_path, local_files_only=True)
+        service.model = AutoModelForSequenceClassification.from_pretrained(args.model_path, local_files_only=True)
+        service.model.eval()
+    else:
+        service.tokenizer, service.model = build_stub_model(tiny=args.tiny)
+
+    service.model_loaded = True
+    return service
+
+
+def headlines(count: int, offset: int = 0) -> List[str]:
+    return [SAMPLE_HEADLINES[(offset + i) % len(SAMPLE_HEADLINES)] for i in range(count)]
+
+
+def measure(fn: Callable[[int], None], items_per_call: int, repeats: int, warmup: int = 2) -> Dict:
+    '''Time fn(i) `repeats` times and summarize latency and throughput.'''
+    for i in range(warmup):
+        fn(i)
+
+    latencies = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - start)
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'calls': repeats,
+        'items_per_call': items_per_call,
+        'headlines_per_sec': round(items_per_call * repeats / sum(latencies), 1),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(latencies_ms, 95)), 3),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 3),
+        'mean_ms': round(float(latencies_ms.mean()), 3)
+    }
+
+
+def run(args) -> Dict:
+    import torch
+
+    service = make_service(args)
+    results = {}
+
+    print(' analyze_sentiment')
+    results['analyze_sentiment'] = measure(
+        lambda i: service.analyze_sentiment(SAMPLE_HEADLINES[i % len(SAMPLE_HEADLINES)]),
+        items_per_call=1, repeats=args.repeats * 4
+    )
+
+    for size in args.batch_sizes:
+        print(f' analyze_batch[{size}]')
+        results[f'analyze_batch[{size}]'] = measure(
+            lambda i, size=size: service.analyze_batch(headlines(size, i), batch_size=size),
+            items_per_call=size, repeats=args.repeats
+        )
+
+    print(' _rule_based_sentiment')
+    results['_rule_based_sentiment'] = measure(
+        lambda i: service._rule_based_sentiment(SAMPLE_HEADLINES[i % len(SAMPLE_HEADLINES)]),
+        items_per_call=1, repeats=2000
+    )
+
+    return {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'torch': torch.__version__,
+            'torch_threads': torch.get_num_threads(),
+            'machine': platform.machine(),
+            'model': args.model_path or ('stub-tiny' if args.tiny else 'stub-bert-base'),
+            'max_length': service_max_length()
+        },
+        'results': results
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def service_max_length() -> int:
+    from api.config import get_settings
+    return get_settings().sentiment_max_length
+
+
+def print_report(report: Dict, baseline: Dict = None):
+    print(f"\n {'benchmark':<24}{'headlines/s':>14}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in report['results'].items():
+        line = f" {name:<24}{r['headlines_per_sec']:>14.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+        old = (baseline or {}).get('results', {}).get(name)
+        if old:
+            line += f"   x{r['headlines_per_sec'] / old['headlines_per_sec']:.2f} vs {baseline['meta'].get('commit', 'baseline')}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline sentiment scoring benchmarks')
+    parser.add_argument('--model-path', default=None, help='Locally saved model dir (default: random stub)')
+    parser.add_argument('--tiny', action='store_true', help='Use a 2-layer stub for quick smoke runs')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=BATCH_SIZES)
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--output', default=None, help='Write results JSON here')
+    parser.add_argument('--compare', default=None, help='Previous results JSON to compare against')
+    args = parser.parse_args()
+
+    report = run(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\n Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
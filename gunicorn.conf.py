@@ -0,0 +1,52 @@
+"""
+Gunicorn config for multi-worker deployments with shared FinBERT weights.
+
+    gunicorn -c gunicorn.conf.py api.main:app
+
+`uvicorn --workers N` spawns fresh interpreters, so every worker loads its
+own copy of FinBERT. Here the master imports the app and loads the weights
+once, then forks the workers. Tensor storage lives outside Python objects
+and is never written during inference, so the pages stay shared
+copy-on-write. gc.freeze() keeps the collector from touching (and copying)
+the objects loaded before the fork.
+
+Only forward passes are deferred to the workers: threaded math libraries
+are not fork-safe once used, so warmup runs per worker (SENTIMENT_PRELOAD).
+Check the sharing via `pss_mb` vs `rss_mb` in /api/v1/metrics.
+"""
+
+import gc
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', '4'))
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = True
+timeout = 120
+
+
+def when_ready(server):
+    from api.config import get_settings
+    from services.sentiment_service import sentiment_service
+    from utils.memory import process_memory
+
+    if get_settings().sentiment_backend != 'torch':
+        # onnxruntime sessions own thread pools and must be created per worker
+        server.log.info('Shared weights need the torch backend; workers will load their own model')
+        return
+
+    sentiment_service.load_model()
+    gc.freeze()
+    server.log.info(f'Master loaded {sentiment_service.model_id}: {process_memory()}')
+
+
+def post_worker_init(worker):
+    from api.config import get_settings
+    from utils.memory import process_memory
+
+    threads = get_settings().torch_num_threads
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+    worker.log.info(f'Worker memory: {process_memory()}')
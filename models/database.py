@@ -11,7 +11,7 @@ analyzed news, and Alerts for generated divergence alerts. Foreign keys link
 users to their subscriptions and alerts."
 """
 
-from sqlalchemy import Column, Integer, String, Float, BigInteger, DateTime, ForeignKey, Text, Index
+from sqlalchemy import Column, Integer, String, Float, BigInteger, DateTime, ForeignKey, Text, Index, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declarative_base
@@ -102,20 +102,29 @@ class SentimentHistory(Base):
     - Trace which news triggered alerts
     - Calculate aggregate sentiment
     - Audit/debug
+    - Skip re-scoring headlines we have already scored (inference memo)
+    
+    One row per (ticker, headline, model); re-scoring upserts it.
     """
     __tablename__ = "sentiment_history"
     
     id = Column(Integer, primary_key=True, index=True)
     ticker = Column(String(10), nullable=False, index=True)
     headline = Column(Text, nullable=False)
+    content_hash = Column(String(40), nullable=False)  # sha1 of normalized headline
+    model_id = Column(String(100), nullable=False)
     source = Column(String(100))
     published_at = Column(DateTime(timezone=True))
     sentiment_score = Column(Float, nullable=False)  # -1 to +1
     sentiment_label = Column(String(20), nullable=False)  # positive/negative/neutral
+    sentiment_confidence = Column(Float)
+    probabilities = Column(JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     __table_args__ = (
         Index('idx_ticker_created', 'ticker', 'created_at'),
+        Index('idx_content_model', 'content_hash', 'model_id'),
+        UniqueConstraint('ticker', 'content_hash', 'model_id', name='uq_ticker_content_model'),
     )
     
     def __repr__(self):
@@ -188,4 +197,62 @@ def get_db():
 def create_tables():
     """Create all tables in database."""
     Base.metadata.create_all(bind=engine)
+    migrate_sentiment_history()
     print("✅ Database tables created successfully")
+
+
+def migrate_sentiment_history():
+    """
+    Bring a sentiment_history table created before the inference memo up
+    to date (create_all never alters existing tables).
+    
+    Adds content_hash, model_id, sentiment_confidence and probabilities,
+    backfills content_hash from the headline, marks old rows as model
+    'legacy', drops duplicate rows (keeping the newest) and adds the
+    (ticker, content_hash, model_id) index and unique constraint.
+    """
+    from sqlalchemy import inspect, text
+    from services.sentiment_cache import content_hash
+    
+    inspector = inspect(engine)
+    constraints = {c["name"] for c in inspector.get_unique_constraints("sentiment_history")}
+    if "uq_ticker_content_model" in constraints:
+        return
+    
+    print("🔧 Migrating sentiment_history for the inference memo...")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE sentiment_history "
+            "ADD COLUMN IF NOT EXISTS content_hash VARCHAR(40), "
+            "ADD COLUMN IF NOT EXISTS model_id VARCHAR(100), "
+            "ADD COLUMN IF NOT EXISTS sentiment_confidence FLOAT, "
+            "ADD COLUMN IF NOT EXISTS probabilities JSON"
+        ))
+        
+        rows = conn.execute(text(
+            "SELECT id, headline FROM sentiment_history WHERE content_hash IS NULL"
+        )).fetchall()
+        if rows:
+            conn.execute(
+                text("UPDATE sentiment_history SET content_hash = :hash WHERE id = :id"),
+                [{"id": row.id, "hash": content_hash(row.headline)} for row in rows]
+            )
+        conn.execute(text("UPDATE sentiment_history SET model_id = 'legacy' WHERE model_id IS NULL"))
+        
+        conn.execute(text(
+            "DELETE FROM sentiment_history a USING sentiment_history b "
+            "WHERE a.ticker = b.ticker AND a.content_hash = b.content_hash "
+            "AND a.model_id = b.model_id AND a.id < b.id"
+        ))
+        conn.execute(text(
+            "ALTER TABLE sentiment_history "
+            "ALTER COLUMN content_hash SET NOT NULL, "
+            "ALTER COLUMN model_id SET NOT NULL"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_content_model ON sentiment_history (content_hash, model_id)"
+        ))
+        conn.execute(text(
+            "ALTER TABLE sentiment_history ADD CONSTRAINT uq_ticker_content_model "
+            "UNIQUE (ticker, content_hash, model_id)"
+        ))
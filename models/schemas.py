@@ -12,6 +12,7 @@ class StockPrice(BaseModel):
 class SentimentData(BaseModel):
     overall_sentiment: str
     score: float
+    decayed_score: Optional[float] = None
     article_count: int
     positive_count: int
     negative_count: int
@@ -0,0 +1,119 @@
+"""
+Build a local model bundle for network-free startup.
+
+Usage:
+    python -m scripts.build_model_bundle --out artifacts/finbert-bundle
+    python -m scripts.build_model_bundle --revision <commit> --version 2024-06
+    python -m scripts.build_model_bundle --out artifacts/finbert-bundle --verify-only
+
+Downloads the model and tokenizer once, saves the weights as safetensors
+next to the tokenizer files and writes manifest.json (source model,
+revision, content version, library versions, sha256 of every file).
+Then loads the bundle the way SentimentService does (offline,
+memory-mapped) and reports cold load time and parity with the source
+model. Point sentiment_model_path at the output directory to use it.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import torch
+import transformers
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from services.model_bundle import (
+    BUNDLE_FORMAT, MANIFEST_FILE, WEIGHTS_FILE, bundle_id, file_sha256, load_manifest, verify_bundle
+)
+from utils.headlines import SAMPLE_HEADLINES
+
+
+def build(model_name: str, revision: str, out_dir: str, version: str = None) -> dict:
+    '''Save tokenizer + safetensors weights and write the manifest.'''
+    os.makedirs(out_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name, revision=revision)
+
+    print(f' Saving {model_name}@{revision} -> {out_dir}')
+    tokenizer.save_pretrained(out_dir)
+    model.save_pretrained(out_dir, safe_serialization=True)
+
+    files = {
+        name: file_sha256(os.path.join(out_dir, name))
+        for name in sorted(os.listdir(out_dir))
+        if name != MANIFEST_FILE and os.path.isfile(os.path.join(out_dir, name))
+    }
+    if WEIGHTS_FILE not in files:
+        raise SystemExit(f'{WEIGHTS_FILE} was not written; is safetensors installed?')
+
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'name': model_name,
+        'revision': getattr(model.config, '_commit_hash', None) or revision,
+        # Content-derived unless given, so rebuilt identical weights keep their id
+        'version': version or files[WEIGHTS_FILE][:12],
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'transformers': transformers.__version__,
+        'torch': torch.__version__,
+        'files': files
+    }
+    with open(os.path.join(out_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_offline(bundle_dir: str):
+    '''Load the bundle exactly like SentimentService does; returns (tokenizer, model, seconds).'''
+    start = time.perf_counter()
+    tokenizer = AutoTokenizer.from_pretrained(bundle_dir, local_files_only=True)
+    model = AutoModelForSequenceClassification.from_pretrained(
+        bundle_dir, local_files_only=True, use_safetensors=True, low_cpu_mem_usage=True
+    )
+    model.eval()
+    return tokenizer, model, time.perf_counter() - start
+
+
+def probabilities(tokenizer, model) -> np.ndarray:
+    with torch.no_grad():
+        inputs = tokenizer(SAMPLE_HEADLINES, return_tensors='pt', truncation=True, padding=True)
+        return torch.nn.functional.softmax(model(**inputs).logits, dim=-1).numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--model', default='ProsusAI/finbert')
+    parser.add_argument('--revision', default='main', help='Hub branch, tag or commit to pin')
+    parser.add_argument('--version', default=None, help='Bundle version (default: weights hash prefix)')
+    parser.add_argument('--out', default='artifacts/finbert-bundle')
+    parser.add_argument('--verify-only', action='store_true', help='Check an existing bundle')
+    args = parser.parse_args()
+
+    if not args.verify_only:
+        build(args.model, args.revision, args.out, args.version)
+
+    manifest = load_manifest(args.out)
+    checks = verify_bundle(args.out)
+    bad = [name for name, ok in checks.items() if not ok]
+    print(f' Bundle {bundle_id(manifest)}: {len(checks)} files, {len(bad)} hash mismatches')
+    for name in bad:
+        print(f'   Mismatch: {name}')
+
+    tokenizer, model, seconds = load_offline(args.out)
+    print(f' Offline cold load: {seconds * 1000:.0f}ms')
+
+    if not args.verify_only:
+        source = AutoModelForSequenceClassification.from_pretrained(args.model, revision=args.revision)
+        source.eval()
+        delta = np.abs(probabilities(tokenizer, model) - probabilities(tokenizer, source)).max()
+        print(f' Max probability delta vs {args.model}: {delta:.2e}')
+
+    if bad:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Distill FinBERT into a small student model (offline, CPU).
+
+Usage:
+    python -m scripts.distill_student --out artifacts/student/student.npz
+    python -m scripts.distill_student --headlines-file headlines.txt --epochs 20
+
+1. Loads distinct headlines from SentimentHistory (or a text file, one per line)
+2. Labels them with the teacher's class probabilities (FinBERT, torch or onnx)
+3. Trains a hashed n-gram linear student on the soft labels
+4. Reports student/teacher agreement on a held-out split and throughput
+   of both models, then saves the student (sentiment_backend='student')
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import List
+
+import numpy as np
+
+from services.sentiment_service import SentimentService, LABEL_INDEX
+from services.student_model import StudentModel
+
+
+def load_headlines(args) -> List[str]:
+    if args.headlines_file:
+        with open(args.headlines_file) as f:
+            return list(dict.fromkeys(line.strip() for line in f if line.strip()))
+
+    from models.database import SessionLocal, SentimentHistory
+    db = SessionLocal()
+    try:
+        rows = db.query(SentimentHistory.headline).distinct().limit(args.limit).all()
+        return [row.headline for row in rows]
+    finally:
+        db.close()
+
+
+def label_with_teacher(texts: List[str], backend: str, batch_size: int):
+    '''Teacher probabilities for each text (texts it failed on are dropped).'''
+    teacher = SentimentService()
+    teacher.backend = backend
+    teacher.cascade = False
+    teacher.load_model()
+    if not teacher.model_loaded:
+        raise SystemExit('Teacher model could not be loaded')
+
+    start = time.perf_counter()
+    results = teacher.analyze_batch(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    kept, probs = [], []
+    for text, result in zip(texts, results):
+        if 'probabilities' not in result:
+            continue
+        kept.append(text)
+        probs.append([result['probabilities'][label] for label in LABEL_INDEX])
+
+    probs = np.asarray(probs, dtype=np.float32)
+    probs /= probs.sum(axis=1, keepdims=True)  # undo rounding drift
+    return kept, probs, len(texts) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Distill FinBERT into a hashed n-gram student')
+    parser.add_argument('--headlines-file', default=None, help='One headline per line (default: SentimentHistory)')
+    parser.add_argument('--limit', type=int, default=200000)
+    parser.add_argument('--teacher-backend', default='torch', choices=['torch', 'onnx'])
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--holdout', type=float, default=0.1)
+    parser.add_argument('--out', default='artifacts/student/student.npz')
+    args = parser.parse_args()
+
+    headlines = load_headlines(args)
+    print(f' {len(headlines)} distinct headlines')
+
+    texts, teacher_probs, teacher_rate = label_with_teacher(headlines, args.teacher_backend, args.batch_size)
+    print(f' Teacher labelled {len(texts)} headlines ({teacher_rate:.1f} headlines/s)')
+
+    rng = np.random.default_rng(0)
+    order = rng.permutation(len(texts))
+    split = int(len(texts) * (1 - args.holdout))
+    train, test = order[:split], order[split:]
+
+    student = StudentModel()
+    history = student.fit([texts[i] for i in train], teacher_probs[train], epochs=args.epochs)
+
+    test_texts = [texts[i] for i in test]
+    start = time.perf_counter()
+    student_probs = student.predict_proba(test_texts)
+    student_rate = len(test_texts) / max(time.perf_counter() - start, 1e-9)
+
+    agreement = float((student_probs.argmax(axis=1) == teacher_probs[test].argmax(axis=1)).mean()) if len(test) else None
+    report = {
+        'headlines': len(texts),
+        'train': len(train),
+        'holdout': len(test),
+        'holdout_agreement': round(agreement, 4) if agreement is not None else None,
+        'holdout_mean_prob_delta': round(float(np.abs(student_probs - teacher_probs[test]).mean()), 4) if len(test) else None,
+        'teacher_headlines_per_sec': round(teacher_rate, 1),
+        'student_headlines_per_sec': round(student_rate, 1),
+        'speedup': round(student_rate / teacher_rate, 1),
+        **history
+    }
+
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    student.save(args.out)
+    with open(os.path.splitext(args.out)[0] + '.report.json', 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(report, indent=2))
+    print(f' Student saved to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
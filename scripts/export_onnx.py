@@ -0,0 +1,113 @@
+"""
+Export FinBERT to ONNX, quantize it to int8 and check parity with torch.
+
+Usage:
+    python -m scripts.export_onnx --out artifacts/finbert-onnx
+    python -m scripts.export_onnx --out artifacts/finbert-onnx --parity-only
+
+Writes model.onnx (fp32), model.int8.onnx (dynamic int8 quantization) and
+the tokenizer files into the output directory, then scores the sample
+headlines with both backends and reports label agreement and the max
+probability delta. Exits non-zero if agreement is below --min-agreement.
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict
+
+import numpy as np
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from services.onnx_backend import OnnxSentimentModel
+from utils.headlines import SAMPLE_HEADLINES
+
+
+def export(model_name: str, out_dir: str, opset: int = 14) -> str:
+    '''Export the torch model to fp32 ONNX and quantize it. Returns int8 path.'''
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    os.makedirs(out_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.config.return_dict = False
+    model.eval()
+
+    sample = tokenizer(SAMPLE_HEADLINES[:2], return_tensors='pt', padding=True)
+    fp32_path = os.path.join(out_dir, 'model.onnx')
+    int8_path = os.path.join(out_dir, 'model.int8.onnx')
+
+    print(f' Exporting {model_name} -> {fp32_path}')
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample['input_ids'], sample['attention_mask'], sample['token_type_ids']),
+            fp32_path,
+            input_names=['input_ids', 'attention_mask', 'token_type_ids'],
+            output_names=['logits'],
+            dynamic_axes={
+                'input_ids': {0: 'batch', 1: 'sequence'},
+                'attention_mask': {0: 'batch', 1: 'sequence'},
+                'token_type_ids': {0: 'batch', 1: 'sequence'},
+                'logits': {0: 'batch'}
+            },
+            opset_version=opset
+        )
+
+    print(f' Quantizing (dynamic int8) -> {int8_path}')
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(out_dir)
+    return int8_path
+
+
+def parity(model_name: str, onnx_path: str) -> Dict:
+    '''Score the sample headlines with torch and ONNX and compare.'''
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    onnx_model = OnnxSentimentModel(onnx_path)
+
+    with torch.no_grad():
+        inputs = tokenizer(SAMPLE_HEADLINES, return_tensors='pt', truncation=True, padding=True)
+        torch_probs = torch.nn.functional.softmax(model(**inputs).logits, dim=-1).numpy()
+
+    inputs = tokenizer(SAMPLE_HEADLINES, return_tensors='np', truncation=True, padding=True)
+    logits = onnx_model(inputs)
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    onnx_probs = exp / exp.sum(axis=-1, keepdims=True)
+
+    agree = torch_probs.argmax(axis=-1) == onnx_probs.argmax(axis=-1)
+    return {
+        'headlines': len(SAMPLE_HEADLINES),
+        'label_agreement': round(float(agree.mean()), 4),
+        'max_prob_delta': round(float(np.abs(torch_probs - onnx_probs).max()), 4),
+        'disagreements': [h for h, ok in zip(SAMPLE_HEADLINES, agree) if not ok]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--model', default='ProsusAI/finbert')
+    parser.add_argument('--out', default='artifacts/finbert-onnx')
+    parser.add_argument('--parity-only', action='store_true')
+    parser.add_argument('--min-agreement', type=float, default=0.95)
+    args = parser.parse_args()
+
+    onnx_path = os.path.join(args.out, 'model.int8.onnx')
+    if not args.parity_only:
+        onnx_path = export(args.model, args.out)
+
+    report = parity(args.model, onnx_path)
+    print(f" Label agreement: {report['label_agreement']:.2%} on {report['headlines']} headlines")
+    print(f" Max probability delta: {report['max_prob_delta']:.4f}")
+    for headline in report['disagreements']:
+        print(f'   Disagrees: {headline}')
+
+    if report['label_agreement'] < args.min_agreement:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Import-time report for CI.
+
+Usage:
+    python -m scripts.import_report
+    python -m scripts.import_report api.main --budget-ms 1500 --json import_report.json
+
+Imports each module in a fresh interpreter with `-X importtime`, prints the
+slowest imports (cumulative time) and fails if a heavy ML package
+(torch, transformers, onnxruntime) was pulled in at import time, or if the
+total exceeds --budget-ms.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+DEFAULT_MODULES = ['api.main', 'services.alert_service', 'services.sentiment_service']
+FORBIDDEN = ['torch', 'transformers', 'onnxruntime']
+
+
+def measure(module: str) -> Dict:
+    '''Import module in a subprocess and parse its -X importtime output.'''
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True
+    )
+
+    timings: List[Dict] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line.split(':', 1)[1].split('|')]
+        timings.append({
+            'module': name,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000
+        })
+
+    # The traceback is interleaved with timing lines; its last line is the exception
+    messages = [line for line in proc.stderr.strip().splitlines() if not line.startswith('import time:')]
+    top_level = [t for t in timings if t['module'] == module]
+    imported = {t['module'].split('.')[0] for t in timings}
+    return {
+        'module': module,
+        'ok': proc.returncode == 0,
+        'error': (messages[-1] if messages else f'exit code {proc.returncode}') if proc.returncode else None,
+        'total_ms': top_level[-1]['cumulative_ms'] if top_level else None,
+        'forbidden_imports': sorted(imported & set(FORBIDDEN)),
+        'slowest': sorted(timings, key=lambda t: t['cumulative_ms'], reverse=True)[:15]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-module import time report')
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--budget-ms', type=float, default=None)
+    parser.add_argument('--json', dest='json_path', default=None)
+    args = parser.parse_args()
+
+    reports = [measure(module) for module in args.modules]
+    failed = False
+
+    for report in reports:
+        print(f"\n {report['module']}: {report['total_ms']} ms")
+        if not report['ok']:
+            print(f"   Import failed: {report['error']}")
+            failed = True
+            continue
+        for t in report['slowest']:
+            print(f"   {t['cumulative_ms']:9.1f} ms  {t['module']}")
+        if report['forbidden_imports']:
+            print(f"   Heavy imports at import time: {', '.join(report['forbidden_imports'])}")
+            failed = True
+        if args.budget_ms and report['total_ms'] > args.budget_ms:
+            print(f"   Over budget ({args.budget_ms} ms)")
+            failed = True
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(reports, f, indent=2)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
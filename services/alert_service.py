@@ -4,9 +4,13 @@ Alert/Divergence Detection Service - ULTRA SENSITIVE FOR TESTING
 
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
+import asyncio
 from services.price_service import price_service
 from services.news_service import news_service
 from services.sentiment_service import sentiment_service
+from services.rule_sentiment import rule_sentiment
+from services.rolling_sentiment import rolling_sentiment
+from services.sentiment_history import sentiment_history
 
 class AlertService:
     
@@ -15,7 +19,7 @@ class AlertService:
         self.sentiment_threshold = 0.1   # Very sensitive (was 0.5)
         self.price_threshold = 0.1       # Very sensitive (was 1.0)
     
-    async def detect_divergence(self, ticker: str, hours: int = 1) -> Optional[Dict]:
+    async def detect_divergence(self, ticker: str, hours: int = 1, include_summaries: bool = False) -> Optional[Dict]:
         print(f' Checking divergence for {ticker} (ULTRA SENSITIVE MODE)...')
         
         # 1. Get price data
@@ -24,9 +28,6 @@ class AlertService:
             print(f'    No price data for {ticker}')
             return None
         
-        price_change = current_price_data['change_percent']
-        current_price = current_price_data['price']
-        
         # 2. Get news - use longer window
         articles = await news_service.get_news_for_ticker(ticker, hours=max(hours, 48))
         
@@ -37,10 +38,25 @@ class AlertService:
         print(f'   Found {len(articles)} articles')
         
         # 3. Analyze sentiment
-        headlines = [a['headline'] for a in articles[:10]]
-        sentiments = sentiment_service.analyze_batch(headlines)
+        sentiments = await sentiment_service.analyze_articles(articles[:10], include_summaries)
         aggregated = sentiment_service.aggregate_sentiment(sentiments)
+        rolling = await self._update_rolling(ticker, articles, sentiments)
         
+        return self._evaluate(ticker, current_price_data, articles, sentiments, aggregated, rolling)
+    
+    async def _update_rolling(self, ticker: str, articles: List[Dict], sentiments: List[Dict]) -> Optional[Dict]:
+        '''Fold newly scored articles into the ticker's decayed state and read it back.'''
+        sentiment_history.record(ticker, articles, sentiments)
+        await rolling_sentiment.update(ticker, articles, sentiments)
+        return await rolling_sentiment.read(ticker)
+    
+    def _evaluate(self, ticker: str, current_price_data: Dict, articles: List[Dict],
+                  sentiments: List[Dict], aggregated: Dict, rolling: Optional[Dict] = None) -> Optional[Dict]:
+        price_change = current_price_data['change_percent']
+        current_price = current_price_data['price']
+        
+        # Divergence is judged on the requested window; the decayed rolling
+        # state is reported alongside it for context
         sentiment_score = aggregated['overall_score']
         sentiment_label = aggregated['overall_sentiment']
         
@@ -75,7 +91,9 @@ class AlertService:
                 'label': sentiment_label,
                 'article_count': len(articles),
                 'positive_count': aggregated['positive_count'],
-                'negative_count': aggregated['negative_count']
+                'negative_count': aggregated['negative_count'],
+                'decayed_score': rolling['score'] if rolling else None,
+                'decayed_weight': rolling['weight'] if rolling else None
             },
             'price': {
                 'current': current_price,
@@ -159,12 +177,71 @@ class AlertService:
             )
     
     async def check_multiple_tickers(self, tickers: List[str], hours: int = 1) -> List[Dict]:
+        # Each ticker once, so its headlines aren't grouped (and counted) twice
+        tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
         print(f'\n Checking {len(tickers)} tickers for divergences...\n')
         alerts = []
         
+        # 1. Fetch prices and news for every ticker concurrently
+        prices = await asyncio.gather(
+            *[price_service.get_current_price(ticker) for ticker in tickers],
+            return_exceptions=True
+        )
+        news = await news_service.get_batch_news(tickers, hours=max(hours, 48))
+        
+        # 2. Score every ticker's headlines in one call
+        ticker_ids, headlines = [], []
         for ticker in tickers:
+            for article in news.get(ticker, [])[:10]:
+                ticker_ids.append(ticker)
+                headlines.append(article['headline'])
+        
+        try:
+            sentiments = await sentiment_service.analyze_batch_cached(headlines, priority='scan')
+        except Exception as e:
+            # One failed call must not fail every ticker; lexicon scoring never rejects
+            print(f'    Scan scoring failed, using rule-based sentiment: {e}')
+            sentiments = rule_sentiment.score_batch(headlines)
+        
+        # 3. Aggregate per ticker in one vectorized call
+        aggregated = sentiment_service.aggregate_grouped(
+            ticker_ids,
+            [s['score'] for s in sentiments],
+            [s.get('confidence', 0.5) for s in sentiments],
+            [s['sentiment'] for s in sentiments]
+        )
+        
+        # 4. Fold into each ticker's rolling state
+        per_ticker = []
+        offset = 0
+        for ticker in tickers:
+            articles = news.get(ticker, [])
+            ticker_sentiments = sentiments[offset:offset + min(len(articles), 10)]
+            offset += len(ticker_sentiments)
+            per_ticker.append((articles, ticker_sentiments))
+        
+        rolling = await asyncio.gather(
+            *[self._update_rolling(ticker, articles, ticker_sentiments)
+              for ticker, (articles, ticker_sentiments) in zip(tickers, per_ticker)],
+            return_exceptions=True
+        )
+        
+        # 5. Check each ticker
+        for ticker, price_data, (articles, ticker_sentiments), state in zip(tickers, prices, per_ticker, rolling):
             try:
-                alert = await self.detect_divergence(ticker, hours)
+                if isinstance(price_data, Exception):
+                    raise price_data
+                if not price_data:
+                    print(f'    No price data for {ticker}')
+                    continue
+                if not articles:
+                    print(f'     No news for {ticker}')
+                    continue
+                
+                print(f' Checking divergence for {ticker}: {len(articles)} articles')
+                if isinstance(state, Exception):
+                    state = None
+                alert = self._evaluate(ticker, price_data, articles, ticker_sentiments, aggregated[ticker], state)
                 if alert:
                     alerts.append(alert)
             except Exception as e:
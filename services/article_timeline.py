@@ -0,0 +1,159 @@
+"""
+Article Timeline
+
+Ingested news, stored per ticker for time-window reads:
+- news:{TICKER}:timeline  sorted set, member = content id, score = published unix time
+- news:{TICKER}:articles  hash, content id -> JSON with the article's headline,
+                          source, url, published_date and summary
+
+The content id is the hash of the normalized headline (the same id the
+rolling sentiment state uses), so a story syndicated by several feeds is
+stored once per ticker. Reading the last N hours is one
+ZREVRANGEBYSCORE with a LIMIT plus an HMGET of the articles, done
+server-side in a single Lua call. Scripts only touch the keys they are
+given, and both keys share the {TICKER} hash tag, so this works on Redis
+Cluster. Entries older than news_retention_hours are trimmed on write and
+both keys expire after the same period. Falls back to an in-process store
+when Redis is unavailable.
+"""
+
+import json
+import time
+from typing import Dict, List, Tuple
+
+from api.config import get_settings
+from services.cache import CacheService, cache
+from services.rolling_sentiment import published_timestamp
+from services.sentiment_cache import content_hash
+
+settings = get_settings()
+
+ARTICLE_FIELDS = ('headline', 'source', 'url', 'published_date', 'summary')
+
+# KEYS: timeline, articles
+# ARGV: ttl, oldest score kept, then (id, score, article JSON) per article
+ADD_SCRIPT = """
+local ttl = tonumber(ARGV[1])
+local added = 0
+for i = 3, #ARGV, 3 do
+    redis.call('HSET', KEYS[2], ARGV[i], ARGV[i + 2])
+    added = added + redis.call('ZADD', KEYS[1], ARGV[i + 1], ARGV[i])
+end
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[2])
+for i = 1, #expired, 1000 do
+    redis.call('HDEL', KEYS[2], unpack(expired, i, math.min(i + 999, #expired)))
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[2])
+redis.call('EXPIRE', KEYS[1], ttl)
+redis.call('EXPIRE', KEYS[2], ttl)
+return added
+"""
+
+# KEYS: timeline, articles
+# ARGV: oldest score wanted, limit
+WINDOW_SCRIPT = """
+local ids = redis.call('ZREVRANGEBYSCORE', KEYS[1], '+inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+if #ids == 0 then
+    return {}
+end
+return redis.call('HMGET', KEYS[2], unpack(ids))
+"""
+
+
+class ArticleTimeline:
+    """Per-ticker, time-ordered article store with O(log n) window reads."""
+
+    def __init__(self, redis_cache: CacheService, retention_hours: int):
+        self.redis_cache = redis_cache
+        self.retention_seconds = retention_hours * 3600
+        # In-process fallback: ticker -> {content id: score}, content id -> (score, article)
+        self._local_timelines: Dict[str, Dict[str, float]] = {}
+        self._local_articles: Dict[str, Tuple[float, Dict]] = {}
+
+    async def add(self, ticker: str, articles: List[Dict]) -> int:
+        '''
+        Store articles on a ticker's timeline (idempotent per headline).
+
+        Args:
+            ticker: Stock ticker symbol
+            articles: Articles with headline, source, url, published_date, summary
+
+        Returns:
+            Number of articles that were not on the timeline yet
+        '''
+        if not articles:
+            return 0
+        ticker = ticker.upper()
+        oldest = time.time() - self.retention_seconds
+        items = [
+            (content_hash(article['headline']), published_timestamp(article.get('published_date')), article)
+            for article in articles
+        ]
+        items = [item for item in items if item[1] >= oldest]
+        if not items:
+            return 0
+
+        if self.redis_cache.redis_client:
+            args = [self.retention_seconds, oldest]
+            for content_id, score, article in items:
+                args.append(content_id)
+                args.append(score)
+                args.append(json.dumps({field: article.get(field) or '' for field in ARTICLE_FIELDS}))
+            added = await self.redis_cache.run_script(
+                ADD_SCRIPT,
+                keys=[self.redis_cache.news_timeline_key(ticker), self.redis_cache.news_articles_key(ticker)],
+                args=args
+            )
+            if added is not None:
+                return int(added)
+
+        return self._add_local(ticker, items, oldest)
+
+    async def window(self, ticker: str, hours: float, limit: int) -> List[Dict]:
+        '''
+        Articles for a ticker published in the last `hours`, newest first,
+        at most `limit` of them.
+        '''
+        ticker = ticker.upper()
+        oldest = time.time() - hours * 3600
+
+        if self.redis_cache.redis_client:
+            rows = await self.redis_cache.run_script(
+                WINDOW_SCRIPT,
+                keys=[self.redis_cache.news_timeline_key(ticker), self.redis_cache.news_articles_key(ticker)],
+                args=[oldest, limit]
+            )
+            if rows is not None:
+                return [json.loads(row) for row in rows if row]
+
+        timeline = self._local_timelines.get(ticker, {})
+        newest = sorted(
+            (item for item in timeline.items() if item[1] >= oldest),
+            key=lambda item: item[1],
+            reverse=True
+        )[:limit]
+        return [
+            dict(self._local_articles[content_id][1])
+            for content_id, _ in newest if content_id in self._local_articles
+        ]
+
+    def _add_local(self, ticker: str, items: List[Tuple[str, float, Dict]], oldest: float) -> int:
+        timeline = self._local_timelines.setdefault(ticker, {})
+        added = 0
+        for content_id, score, article in items:
+            if content_id not in timeline:
+                added += 1
+            timeline[content_id] = score
+            self._local_articles[content_id] = (
+                score, {field: article.get(field) or '' for field in ARTICLE_FIELDS}
+            )
+
+        for content_id in [cid for cid, score in timeline.items() if score < oldest]:
+            del timeline[content_id]
+        for content_id in [cid for cid, (score, _) in self._local_articles.items() if score < oldest]:
+            del self._local_articles[content_id]
+        return added
+
+
+# Global instance
+article_timeline = ArticleTimeline(cache, retention_hours=settings.news_retention_hours)
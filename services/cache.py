@@ -6,7 +6,7 @@ Implements cache-aside pattern with TTL expiration.
 
 import redis.asyncio as redis
 import json
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List
 from datetime import timedelta
 
 from api.config import get_settings
@@ -19,6 +19,7 @@ class CacheService:
     
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
+        self._scripts: Dict[str, Any] = {}
     
     async def connect(self):
         """Connect to Redis with connection pooling."""
@@ -70,6 +71,61 @@ class CacheService:
             print(f"❌ Cache SET error: {key} - {e}")
             return False
     
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round trip (None for each miss)."""
+        if not self.redis_client or not keys:
+            return [None] * len(keys)
+        
+        try:
+            values = await self.redis_client.mget(keys)
+            return [json.loads(value) if value else None for value in values]
+        except Exception as e:
+            print(f"❌ Cache MGET error: {len(keys)} keys - {e}")
+            return [None] * len(keys)
+    
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values in one pipelined round trip with optional TTL (seconds)."""
+        if not self.redis_client or not items:
+            return False
+        
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    serialized = json.dumps(value)
+                    if ttl:
+                        pipe.setex(key, timedelta(seconds=ttl), serialized)
+                    else:
+                        pipe.set(key, serialized)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            print(f"❌ Cache MSET error: {len(items)} keys - {e}")
+            return False
+    
+    async def hgetall(self, key: str) -> dict:
+        """Get all fields of a hash (empty dict if missing)."""
+        if not self.redis_client:
+            return {}
+        
+        try:
+            return await self.redis_client.hgetall(key)
+        except Exception as e:
+            print(f"❌ Cache HGETALL error: {key} - {e}")
+            return {}
+    
+    async def run_script(self, script: str, keys: List[str], args: List[Any]) -> Any:
+        """Run a Lua script atomically (cached server-side by SHA)."""
+        if not self.redis_client:
+            return None
+        
+        try:
+            if script not in self._scripts:
+                self._scripts[script] = self.redis_client.register_script(script)
+            return await self._scripts[script](keys=keys, args=args)
+        except Exception as e:
+            print(f"❌ Cache SCRIPT error: {keys} - {e}")
+            return None
+    
     async def delete(self, key: str) -> bool:
         """Delete key from cache."""
         if not self.redis_client:
@@ -104,6 +160,32 @@ class CacheService:
         """Generate cache key for sentiment data."""
         return f"sentiment:{ticker.upper()}"
     
+    @staticmethod
+    def headline_sentiment_key(digest: str) -> str:
+        """Generate cache key for a single scored headline (content hash)."""
+        return f"headline_sentiment:{digest}"
+    
+    @staticmethod
+    def rolling_sentiment_key(ticker: str) -> str:
+        """Generate cache key for a ticker's time-decayed sentiment state."""
+        return f"rolling_sentiment:{ticker.upper()}"
+    
+    @staticmethod
+    def rolling_seen_key(ticker: str) -> str:
+        """Generate cache key for the articles already folded into that state (sorted set)."""
+        return f"rolling_sentiment:{ticker.upper()}:seen_at"
+    
+    @staticmethod
+    def news_timeline_key(ticker: str) -> str:
+        """Generate cache key for a ticker's article timeline (sorted set)."""
+        # Hash tag keeps a ticker's timeline and articles in one cluster slot
+        return f"news:{{{ticker.upper()}}}:timeline"
+    
+    @staticmethod
+    def news_articles_key(ticker: str) -> str:
+        """Generate cache key for a ticker's stored articles (hash: content id -> JSON)."""
+        return f"news:{{{ticker.upper()}}}:articles"
+    
     @staticmethod
     def rate_limit_key(api_key: str, window: str = "minute") -> str:
         """Generate cache key for rate limiting."""
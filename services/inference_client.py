@@ -0,0 +1,199 @@
+"""
+Inference Server Client
+
+Thin async client for the standalone inference server
+(`python -m services.inference_server`). One persistent connection per
+process carries newline-delimited JSON requests; responses are matched to
+callers by request id, so concurrent requests share the connection and
+the server batches them together.
+
+If the server can't be reached, the connection drops or the server
+reports an internal error, callers get a ConnectionError and
+SentimentService falls back to in-process inference. Reconnects are
+attempted at most every inference_server_retry_seconds.
+"""
+
+import asyncio
+import itertools
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from api.config import get_settings
+from services.inference_executor import InferenceRejected, InferenceTimeout
+from services.inference_queue import DEFAULT_PRIORITY
+
+settings = get_settings()
+
+# Big enough for a full batch of texts/results on one line
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+def parse_address(url: str) -> Tuple[str, ...]:
+    '''
+    'unix:///run/sentiment.sock' -> ('unix', '/run/sentiment.sock')
+    'tcp://127.0.0.1:8765'      -> ('tcp', '127.0.0.1', 8765)
+    '''
+    parsed = urlparse(url)
+    if parsed.scheme == 'unix':
+        return ('unix', parsed.path)
+    if parsed.scheme == 'tcp':
+        return ('tcp', parsed.hostname, parsed.port or 8765)
+    raise ValueError(f'Unsupported inference server URL: {url}')
+
+
+async def open_connection(url: str):
+    address = parse_address(url)
+    if address[0] == 'unix':
+        return await asyncio.open_unix_connection(address[1], limit=STREAM_LIMIT)
+    return await asyncio.open_connection(address[1], address[2], limit=STREAM_LIMIT)
+
+
+class InferenceClient:
+    """Multiplexed client for the inference server."""
+
+    def __init__(self, url: str, retry_seconds: float, timeout_seconds: float):
+        self.url = url
+        self.retry_seconds = retry_seconds
+        self.timeout_seconds = timeout_seconds
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._retry_at = 0.0
+        self._model_id: Optional[str] = None
+
+        # Metrics
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    async def _connect(self):
+        if self._writer and not self._writer.is_closing():
+            return
+        if time.monotonic() < self._retry_at:
+            raise ConnectionError('Inference server unavailable (backing off)')
+
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer and not self._writer.is_closing():
+                return
+            try:
+                self._reader, self._writer = await asyncio.wait_for(
+                    open_connection(self.url), self.timeout_seconds
+                )
+            except (OSError, asyncio.TimeoutError) as e:
+                self._retry_at = time.monotonic() + self.retry_seconds
+                raise ConnectionError(f'Cannot reach inference server at {self.url}: {e}')
+            self._reader_task = asyncio.get_running_loop().create_task(self._read_responses())
+            print(f' Connected to inference server at {self.url}')
+
+    async def _read_responses(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get('id'), None)
+                if future and not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            print(f' Inference server connection error: {e}')
+        finally:
+            # Connection is gone: fail everything still waiting
+            if self._writer:
+                self._writer.close()
+            self._writer = None
+            self._model_id = None
+            self._retry_at = time.monotonic() + self.retry_seconds
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('Inference server connection lost'))
+            self._pending.clear()
+
+    async def _request(self, payload: Dict, timeout: Optional[float] = None) -> Dict:
+        await self._connect()
+        writer = self._writer
+        if writer is None or writer.is_closing():
+            # Connection dropped right after connecting
+            self.failures += 1
+            raise ConnectionError('Inference server connection lost')
+
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.requests += 1
+
+        try:
+            writer.write(json.dumps({'id': request_id, **payload}).encode('utf-8') + b'\n')
+            await writer.drain()
+            # Slightly longer than the server's own timeout so its error wins
+            response = await asyncio.wait_for(future, timeout or self.timeout_seconds + 1.0)
+        except asyncio.TimeoutError:
+            self._pending.pop(request_id, None)
+            raise InferenceTimeout('Inference server did not respond in time')
+        except (OSError, ConnectionError) as e:
+            self._pending.pop(request_id, None)
+            self.failures += 1
+            raise ConnectionError(str(e))
+
+        error = response.get('error')
+        if error == 'rejected':
+            raise InferenceRejected(response.get('message', 'Inference server saturated'))
+        if error == 'timeout':
+            raise InferenceTimeout(response.get('message', 'Inference server timed out'))
+        if error:
+            # Broken server-side scoring: callers fall back to in-process scoring
+            self.failures += 1
+            raise ConnectionError(f"Inference server error: {response.get('message')}")
+        return response
+
+    async def model_id(self) -> str:
+        '''Model id the server scores with (part of the sentiment cache key).'''
+        if self._model_id is None or not self._writer:
+            response = await self._request({'op': 'info'})
+            if not response.get('ready', True):
+                # Server still loading; ask again next time
+                return response['model_id']
+            self._model_id = response['model_id']
+        return self._model_id
+
+    async def score(self, texts: List[str], priority: str = DEFAULT_PRIORITY) -> List[Dict]:
+        '''Score texts on the server (batched with other clients' requests).'''
+        if not texts:
+            return []
+        response = await self._request({'op': 'score', 'texts': texts, 'priority': priority})
+        return response['results']
+
+    async def close(self):
+        if self._writer:
+            self._writer.close()
+        if self._reader_task:
+            self._reader_task.cancel()
+
+    def stats(self) -> Dict:
+        return {
+            'url': self.url,
+            'connected': bool(self._writer and not self._writer.is_closing()),
+            'model_id': self._model_id,
+            'requests': self.requests,
+            'failures': self.failures,
+            'pending': len(self._pending)
+        }
+
+
+# Global instance (disabled when inference_server_url is empty)
+inference_client = InferenceClient(
+    settings.inference_server_url,
+    retry_seconds=settings.inference_server_retry_seconds,
+    timeout_seconds=settings.inference_timeout_seconds
+)
@@ -0,0 +1,121 @@
+"""
+Inference Executor
+
+Runs CPU-bound model work (loading, forward passes) on a dedicated,
+bounded thread pool so it never blocks the asyncio event loop. PyTorch
+releases the GIL inside its kernels, so threads are enough here.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from api.config import get_settings
+
+settings = get_settings()
+
+
+class InferenceRejected(Exception):
+    """Raised when the inference pool/queue is saturated."""
+
+
+class InferenceTimeout(Exception):
+    """Raised when an inference call exceeds its timeout."""
+
+
+class InferenceExecutor:
+    """Bounded thread pool with an awaitable API."""
+
+    def __init__(self, max_workers: int, max_pending: int, timeout_seconds: float):
+        '''
+        Args:
+            max_workers: Threads running inference concurrently
+            max_pending: Extra calls allowed to wait for a free thread
+            timeout_seconds: Default per-call timeout
+        '''
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+
+        # Created lazily so the pool is never inherited across fork()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+        # Metrics
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='inference'
+            )
+        return self._pool
+
+    def _release(self, _future):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        '''
+        Run fn(*args, **kwargs) on the pool and await its result.
+
+        Raises:
+            InferenceRejected: if every thread is busy and the wait list is full
+            InferenceTimeout: if the call takes longer than timeout seconds
+        '''
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_pending:
+                self.rejected += 1
+                raise InferenceRejected(
+                    f'Inference pool saturated ({self.in_flight} calls in flight)'
+                )
+            self.in_flight += 1
+
+        # Slots are released when the thread finishes, not when the caller
+        # gives up, so timed-out work still counts against the bound
+        try:
+            future = self._get_pool().submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            # Never reached the pool (e.g. after shutdown): give the slot back
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(self._release)
+
+        timeout = self.timeout_seconds if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise InferenceTimeout(f'Inference call exceeded {timeout:.1f}s')
+
+    def shutdown(self):
+        '''Stop the pool (does not wait for running calls).'''
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict:
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'in_flight': self.in_flight,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts
+        }
+
+
+# Global instance
+inference_executor = InferenceExecutor(
+    max_workers=settings.inference_workers,
+    max_pending=settings.inference_max_pending,
+    timeout_seconds=settings.inference_timeout_seconds
+)
@@ -0,0 +1,264 @@
+"""
+Dynamic Micro-Batching Queue
+
+Async front-end for sentiment inference. Texts submitted by concurrent
+requests are collected for a short window (or until a batch is full),
+scored in one batched forward pass, and handed back to each caller
+through its own future.
+
+Every submission has a priority class. Batches are filled from the
+highest class first, so an interactive request waits for at most the
+batch already running, however large the scan/background backlog is.
+Each class has its own queue limit (a background backlog can't cause
+interactive rejections), and a lower-class request that has waited
+longer than starvation_ms jumps ahead of the higher classes.
+"""
+
+import asyncio
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.inference_executor import InferenceExecutor, InferenceRejected, InferenceTimeout
+
+# Highest priority first
+PRIORITIES = ('interactive', 'scan', 'background')
+DEFAULT_PRIORITY = 'interactive'
+
+# Recent queue waits kept per class for percentiles
+WAIT_SAMPLES = 1024
+
+# (texts, future, enqueued_at)
+QueueItem = Tuple[List[str], asyncio.Future, float]
+
+
+class MicroBatcher:
+    """Collects texts across in-flight requests into shared batches."""
+
+    def __init__(self, score_batch: Callable[..., List[Dict]], executor: InferenceExecutor,
+                 window_ms: float = 5.0, max_batch_size: int = 64, max_queue_size: int = 2048,
+                 starvation_ms: float = 1000.0):
+        '''
+        Args:
+            score_batch: Sync function (texts, batch_size=...) -> results
+            executor: Pool the batches run on (keeps the event loop free)
+            window_ms: How long to wait for more texts after the first arrives
+            max_batch_size: Dispatch as soon as this many texts are queued
+            max_queue_size: Reject new texts beyond this many waiting (per class)
+            starvation_ms: Queue wait after which a lower class goes first
+        '''
+        self.score_batch = score_batch
+        self.executor = executor
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        # One share of a batch per class: promoted chunks of the lower
+        # classes can't crowd the highest class out of a batch
+        self.chunk_size = max(1, max_batch_size // len(PRIORITIES))
+        self.max_queue_size = max_queue_size
+        self.starvation = starvation_ms / 1000.0
+
+        self._queues: Dict[str, Deque[QueueItem]] = {priority: deque() for priority in PRIORITIES}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.queue_depth = 0  # texts waiting to be batched
+        self.batches_run = 0
+        self.texts_scored = 0
+        self.max_batch_seen = 0
+        self.last_batch_size = 0
+        self.rejected = 0
+        self.promoted = 0  # requests moved ahead because they were starving
+        self.class_depth = {priority: 0 for priority in PRIORITIES}
+        self.class_submitted = {priority: 0 for priority in PRIORITIES}
+        self.class_rejected = {priority: 0 for priority in PRIORITIES}
+        self.class_waits: Dict[str, Deque[float]] = {
+            priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITIES
+        }
+
+    def start(self):
+        '''Start the batching loop on the running event loop (idempotent).'''
+        if self._worker and not self._worker.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        '''Stop the batching loop and fail anything still queued.'''
+        if not self._worker:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        for queue in self._queues.values():
+            while queue:
+                _, future, _ = queue.popleft()
+                if not future.done():
+                    future.set_exception(RuntimeError('Inference queue stopped'))
+        self._worker = None
+        self.queue_depth = 0
+        self.class_depth = {priority: 0 for priority in PRIORITIES}
+
+    async def submit(self, texts: List[str], timeout: Optional[float] = None,
+                     priority: str = DEFAULT_PRIORITY) -> List[Dict]:
+        '''
+        Queue texts for the next batch and wait for their results.
+
+        Args:
+            texts: Texts to score
+            timeout: Seconds to wait (defaults to the executor's timeout)
+            priority: 'interactive', 'scan' or 'background'
+
+        Returns:
+            List of sentiment dictionaries (same order as texts)
+
+        Raises:
+            InferenceRejected: if the queue is full
+            InferenceTimeout: if results don't arrive in time
+        '''
+        if priority not in self._queues:
+            raise ValueError(f'Unknown inference priority: {priority}')
+        if not texts:
+            return []
+
+        if self.class_depth[priority] + len(texts) > self.max_queue_size:
+            self.rejected += 1
+            self.class_rejected[priority] += 1
+            raise InferenceRejected(
+                f'Inference queue full ({self.class_depth[priority]} {priority} texts waiting)'
+            )
+
+        self.start()
+        loop = asyncio.get_running_loop()
+        # Requests are queued in chunks of at most chunk_size texts, so no
+        # request stretches a batch past max_batch_size and promoted chunks
+        # always leave room for the highest class
+        futures = []
+        for start in range(0, len(texts), self.chunk_size):
+            future = loop.create_future()
+            self._queues[priority].append((list(texts[start:start + self.chunk_size]), future, loop.time()))
+            futures.append(future)
+        self.queue_depth += len(texts)
+        self.class_depth[priority] += len(texts)
+        self.class_submitted[priority] += 1
+        self._wakeup.set()
+
+        timeout = self.executor.timeout_seconds if timeout is None else timeout
+        try:
+            chunks = await asyncio.wait_for(asyncio.gather(*futures), timeout)
+        except asyncio.TimeoutError:
+            raise InferenceTimeout(f'No inference result within {timeout:.1f}s')
+        return [result for chunk in chunks for result in chunk]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self.queue_depth:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            # Keep collecting until the window closes or a batch is full
+            deadline = loop.time() + self.window
+            while self.queue_depth < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            await self._dispatch(self._take_batch(loop.time()))
+
+    def _take_batch(self, now: float) -> List[Tuple[List[str], asyncio.Future]]:
+        '''
+        Pop up to max_batch_size texts, highest class first. The oldest
+        chunk of each class that has waited past the starvation limit goes
+        in first - one chunk per class per batch, so a backlog of old
+        background work can't take over the whole batch. Chunks are at most
+        chunk_size texts (see submit), so promoted ones always leave room
+        for the highest class and a batch never exceeds max_batch_size.
+        '''
+        batch, count = [], 0
+
+        def take(priority: str):
+            nonlocal count
+            texts, future, enqueued_at = self._queues[priority].popleft()
+            batch.append((texts, future))
+            count += len(texts)
+            self.class_depth[priority] -= len(texts)
+            self.class_waits[priority].append(now - enqueued_at)
+
+        for priority in PRIORITIES[1:]:
+            queue = self._queues[priority]
+            if (queue and now - queue[0][2] >= self.starvation
+                    and count + len(queue[0][0]) <= self.max_batch_size):
+                take(priority)
+                self.promoted += 1
+
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            while queue and count + len(queue[0][0]) <= self.max_batch_size:
+                take(priority)
+            if count >= self.max_batch_size or queue:
+                break
+
+        self.queue_depth -= count
+        return batch
+
+    async def _dispatch(self, batch: List[Tuple[List[str], asyncio.Future]]):
+        texts = [text for item_texts, _ in batch for text in item_texts]
+
+        try:
+            results = await self.executor.run(
+                self.score_batch, texts, batch_size=self.max_batch_size
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_run += 1
+        self.texts_scored += len(texts)
+        self.last_batch_size = len(texts)
+        self.max_batch_seen = max(self.max_batch_seen, len(texts))
+
+        # Hand each caller back its own slice
+        offset = 0
+        for item_texts, future in batch:
+            if not future.done():
+                future.set_result(results[offset:offset + len(item_texts)])
+            offset += len(item_texts)
+
+    def stats(self) -> Dict:
+        '''Queue depth, batch-size and per-class queue-wait metrics.'''
+        classes = {}
+        for priority in PRIORITIES:
+            waits = np.array(self.class_waits[priority]) * 1000.0
+            classes[priority] = {
+                'queue_depth': self.class_depth[priority],
+                'submitted': self.class_submitted[priority],
+                'rejected': self.class_rejected[priority],
+                'wait_ms_p50': round(float(np.percentile(waits, 50)), 2) if len(waits) else None,
+                'wait_ms_p99': round(float(np.percentile(waits, 99)), 2) if len(waits) else None,
+                'wait_ms_max': round(float(waits.max()), 2) if len(waits) else None
+            }
+        return {
+            'queue_depth': self.queue_depth,
+            'batches_run': self.batches_run,
+            'texts_scored': self.texts_scored,
+            'avg_batch_size': round(self.texts_scored / self.batches_run, 2) if self.batches_run else 0.0,
+            'max_batch_size_seen': self.max_batch_seen,
+            'last_batch_size': self.last_batch_size,
+            'window_ms': self.window * 1000.0,
+            'max_batch_size': self.max_batch_size,
+            'rejected': self.rejected,
+            'starvation_ms': self.starvation * 1000.0,
+            'starvation_promotions': self.promoted,
+            'classes': classes
+        }
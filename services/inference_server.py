@@ -0,0 +1,147 @@
+"""
+Standalone Inference Server
+
+Owns the sentiment model and serves scoring requests from every API and
+Celery worker over a Unix socket or localhost TCP, so inference capacity
+(and model memory) is sized separately from HTTP capacity.
+
+    python -m services.inference_server                      # inference_server_bind
+    python -m services.inference_server tcp://0.0.0.0:8765
+
+Protocol: newline-delimited JSON, one object per request/response.
+    -> {"id": 1, "op": "score", "texts": ["..."], "priority": "interactive"}
+    <- {"id": 1, "results": [{...sentiment dict...}]}
+    -> {"id": 2, "op": "info"}
+    <- {"id": 2, "model_id": "ProsusAI/finbert", "ready": true}
+Errors come back as {"id": n, "error": "rejected"|"timeout"|"error", "message": "..."}.
+Until the model has loaded ("ready": false) texts are scored rule-based
+and "info" reports the model id as "rule-based".
+
+Requests from all connections go through the same MicroBatcher, so texts
+from different clients share forward passes; "priority" (interactive, scan
+or background, default interactive) picks the batcher's queue class.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+from api.config import get_settings
+from services.inference_client import STREAM_LIMIT, parse_address
+from services.inference_executor import inference_executor, InferenceRejected, InferenceTimeout
+from services.inference_queue import DEFAULT_PRIORITY
+from services.rule_sentiment import rule_sentiment
+from services.sentiment_service import sentiment_service
+
+settings = get_settings()
+
+
+class InferenceServer:
+    """Accepts client connections and scores their texts in shared batches."""
+
+    def __init__(self, service=sentiment_service):
+        self.service = service
+        self.connections = 0
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # Handle requests concurrently so one connection can carry many
+                task = asyncio.create_task(self._handle_request(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.connections -= 1
+            writer.close()
+
+    async def _handle_request(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            response = await self._dispatch(request)
+        except InferenceRejected as e:
+            response = {'error': 'rejected', 'message': str(e)}
+        except InferenceTimeout as e:
+            response = {'error': 'timeout', 'message': str(e)}
+        except Exception as e:
+            response = {'error': 'error', 'message': str(e)}
+
+        response['id'] = request_id
+        async with write_lock:
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+            await writer.drain()
+
+    async def _dispatch(self, request: dict) -> dict:
+        op = request.get('op')
+        if op == 'score':
+            if not self.service.ready:
+                # Still loading: don't queue behind the load thread
+                return {'results': rule_sentiment.score_batch(request.get('texts', []))}
+            return {'results': await self.service.batcher.submit(
+                request.get('texts', []),
+                priority=request.get('priority', DEFAULT_PRIORITY)
+            )}
+        if op == 'info':
+            model_id = self.service.model_id if self.service.ready else 'rule-based'
+            return {'model_id': model_id, 'ready': self.service.ready}
+        if op == 'stats':
+            return {
+                'connections': self.connections,
+                'inference_queue': self.service.batcher.stats(),
+                'inference_executor': inference_executor.stats()
+            }
+        raise ValueError(f'Unknown op: {op}')
+
+    async def serve(self, url: str):
+        # Load and warm the model before accepting connections
+        self.service.ready = False
+        try:
+            await inference_executor.run(
+                self.service.preload,
+                settings.sentiment_warmup_batch_sizes,
+                timeout=settings.model_load_timeout_seconds
+            )
+        except InferenceTimeout:
+            # The load keeps running on its thread and marks the service ready
+            print(f' Model still loading after {settings.model_load_timeout_seconds:.0f}s, '
+                  f'serving rule-based sentiment until it finishes')
+        except Exception as e:
+            print(f' Model preload error: {e}')
+            self.service.ready = True
+
+        address = parse_address(url)
+        if address[0] == 'unix':
+            if os.path.exists(address[1]):
+                os.unlink(address[1])
+            server = await asyncio.start_unix_server(self.handle_connection, address[1], limit=STREAM_LIMIT)
+        else:
+            server = await asyncio.start_server(self.handle_connection, address[1], address[2], limit=STREAM_LIMIT)
+
+        print(f' Inference server ({self.service.model_id}) listening on {url}')
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else settings.inference_server_bind
+    try:
+        asyncio.run(InferenceServer().serve(url))
+    except KeyboardInterrupt:
+        print('Shutting down inference server...')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Local Model Bundle
+
+A directory holding everything the torch backend needs to start without
+the Hugging Face hub: config, tokenizer files, safetensors weights and a
+manifest.json recording where they came from and a content version.
+
+    artifacts/finbert-bundle/
+        manifest.json
+        config.json
+        model.safetensors
+        tokenizer.json, vocab.txt, tokenizer_config.json, ...
+
+Built by `python -m scripts.build_model_bundle`, loaded by
+SentimentService when sentiment_model_path is set. The version goes into
+the model id, so cached and stored scores are tied to the exact weights.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict
+
+MANIFEST_FILE = 'manifest.json'
+WEIGHTS_FILE = 'model.safetensors'
+BUNDLE_FORMAT = 1
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(bundle_dir: str) -> Dict:
+    '''
+    Read and sanity-check a bundle's manifest (no hashing, so it's cheap
+    enough for every startup; use verify_bundle for a full check).
+
+    Raises:
+        FileNotFoundError: if the bundle, manifest or a listed file is missing
+        ValueError: if the manifest is from an unknown bundle format
+    '''
+    path = os.path.join(bundle_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f'No model bundle manifest at {path}')
+
+    with open(path) as f:
+        manifest = json.load(f)
+
+    if manifest.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported model bundle format: {manifest.get('format')}")
+    for name in manifest.get('files', {}):
+        if not os.path.exists(os.path.join(bundle_dir, name)):
+            raise FileNotFoundError(f'Model bundle is missing {name}')
+    return manifest
+
+
+def verify_bundle(bundle_dir: str) -> Dict[str, bool]:
+    '''Check every file against the manifest's sha256 (file name -> ok).'''
+    manifest = load_manifest(bundle_dir)
+    return {
+        name: file_sha256(os.path.join(bundle_dir, name)) == expected
+        for name, expected in manifest['files'].items()
+    }
+
+
+def bundle_id(manifest: Dict) -> str:
+    '''Model id for a bundle: source model name plus content version.'''
+    return f"{manifest['name']}@{manifest['version']}"
@@ -1,15 +1,121 @@
 
 """
 News scraping service - fetches financial news from multiple sources.
+
+Feeds are downloaded concurrently through one shared aiohttp session
+(pooled keep-alive connections, per-request timeouts) and parsed by
+feedparser in a worker thread, so the event loop never blocks on
+network I/O or XML parsing.
+
+Each parsed feed is kept as a snapshot for news_feed_refresh_seconds and
+shared by every ticker, so upstream traffic scales with the number of
+feeds, not tickers x feeds. Concurrent lookups that find a snapshot stale
+share one refresh. New entries of the general feeds are indexed by the
+tickers they mention (services.ticker_index) and added to those tickers'
+article timelines (services.article_timeline); a lookup is a time-window
+read on the ticker's timeline.
 """
 
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Set
+from datetime import datetime
 import asyncio
+import time
 import aiohttp
 from bs4 import BeautifulSoup
 import feedparser
 
+from api.config import get_settings
+from services.article_timeline import article_timeline
+from services.ticker_index import TickerIndex, mention_keys
+
+settings = get_settings()
+
+USER_AGENT = 'Mozilla/5.0 (compatible; SentimentMarketAlerts/1.0)'
+
+def _clean_summary(summary: str) -> str:
+    '''Plain text of an RSS summary (feeds often send HTML), truncated.'''
+    if not summary:
+        return ''
+    text = BeautifulSoup(summary, 'html.parser').get_text(' ')
+    return ' '.join(text.split())[:settings.summary_max_chars]
+
+class FeedSnapshot:
+    """One parsed download of a feed, shared by every ticker lookup."""
+    
+    __slots__ = ('url', 'source', 'entries', 'by_guid', 'etag', 'last_modified',
+                 'high_water', 'new_guids', 'ingest_task', 'fetched_at')
+    
+    def __init__(self, url: str, source: str, entries: List[Dict], etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, new_guids: Optional[List[str]] = None):
+        self.url = url
+        self.source = source
+        self.entries = entries
+        self.by_guid = {entry['guid']: entry for entry in entries}
+        # Validators for the next conditional GET
+        self.etag = etag
+        self.last_modified = last_modified
+        # Newest published time seen, and the entries this refresh added
+        self.high_water = max((e['published'] for e in entries if e['published']), default=None)
+        self.new_guids = new_guids if new_guids is not None else [e['guid'] for e in entries]
+        # Adds a ticker feed's new entries to its timeline (shared by requests)
+        self.ingest_task: Optional[asyncio.Task] = None
+        self.fetched_at = time.monotonic()
+    
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+    
+    @property
+    def new_entries(self) -> int:
+        return len(self.new_guids)
+    
+    def touch(self):
+        '''Mark as fresh again (the feed answered 304 Not Modified).'''
+        self.fetched_at = time.monotonic()
+
+def _build_entry(entry, guid: str) -> Dict:
+    title = entry.get('title', '')
+    summary = _clean_summary(entry.get('summary', ''))
+    pub_date = entry.get('published_parsed')
+    return {
+        'guid': guid,
+        'title': title,
+        'summary': summary,
+        'link': entry.get('link', ''),
+        'source': entry.get('source', {}).get('title'),
+        'published': datetime(*pub_date[:6]) if pub_date else None,
+        'mention_keys': mention_keys(f'{title} {summary}')
+    }
+
+def _to_article(source: str, entry: Dict) -> Dict:
+    return {
+        'headline': entry['title'],
+        'source': source,
+        'url': entry['link'],
+        'published_date': (entry['published'] or datetime.utcnow()).isoformat(),
+        'summary': entry['summary']
+    }
+
+def _parse_feed(url: str, body: bytes, previous: Optional[FeedSnapshot] = None,
+                etag: Optional[str] = None, last_modified: Optional[str] = None) -> FeedSnapshot:
+    '''
+    Parse a feed body into a snapshot (CPU-bound; runs in a worker thread).
+    Entries already in the previous snapshot (same guid) are reused as-is,
+    so only unseen entries are cleaned, tokenized and later matched.
+    '''
+    feed = feedparser.parse(body)
+    known = previous.by_guid if previous else {}
+    entries, new_guids = [], []
+    for entry in feed.entries:
+        guid = entry.get('id') or entry.get('link') or entry.get('title', '')
+        parsed = known.get(guid)
+        if parsed is None:
+            parsed = _build_entry(entry, guid)
+            new_guids.append(guid)
+        entries.append(parsed)
+    return FeedSnapshot(url, feed.feed.get('title', 'RSS Feed'), entries,
+                        etag=etag, last_modified=last_modified, new_guids=new_guids)
+
 class NewsService:
     def __init__(self):
         self.rss_feeds = {
@@ -19,105 +125,210 @@ class NewsService:
                 'https://www.investing.com/rss/news.rss'
             ]
         }
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._snapshots: Dict[str, FeedSnapshot] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.ticker_index = TickerIndex()
+        # Tickers whose timeline has been backfilled from the indexed entries
+        self._seeded: Set[str] = set()
+        
+        # Metrics
+        self.feed_fetches = 0
+        self.snapshot_hits = 0
+        self.coalesced_refreshes = 0
+        self.not_modified = 0
+        self.new_entries = 0
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        '''Shared HTTP session (created on first use, on the running loop).'''
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=settings.news_http_pool_size,
+                    keepalive_timeout=settings.news_keepalive_seconds,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=settings.news_fetch_timeout_seconds,
+                    connect=settings.news_connect_timeout_seconds
+                ),
+                headers={'User-Agent': USER_AGENT}
+            )
+        return self._session
+    
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+    
+    async def _fetch_feed(self, url: str, previous: Optional[FeedSnapshot] = None) -> Optional[FeedSnapshot]:
+        '''
+        Download a feed and parse it off the event loop. With a previous
+        snapshot the request is conditional (If-None-Match /
+        If-Modified-Since); a 304 returns the previous snapshot, refreshed.
+        
+        Returns:
+            Parsed feed snapshot, or None if the request failed
+        '''
+        headers = {}
+        if previous and previous.etag:
+            headers['If-None-Match'] = previous.etag
+        if previous and previous.last_modified:
+            headers['If-Modified-Since'] = previous.last_modified
+        
+        self.feed_fetches += 1
+        try:
+            async with self._get_session().get(url, headers=headers) as response:
+                if response.status == 304 and previous:
+                    self.not_modified += 1
+                    previous.touch()
+                    return previous
+                response.raise_for_status()
+                body = await response.read()
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f'⚠️  Feed fetch error ({url}): {e!r}')
+            return None
+        
+        snapshot = await asyncio.to_thread(_parse_feed, url, body, previous, etag, last_modified)
+        self.new_entries += snapshot.new_entries
+        return snapshot
+    
+    async def _get_feed(self, url: str) -> Optional[FeedSnapshot]:
+        '''
+        Current snapshot of a feed, refreshed at most once per
+        news_feed_refresh_seconds. Callers arriving while a refresh is
+        in flight wait for that refresh instead of starting their own.
+        '''
+        snapshot = self._snapshots.get(url)
+        if snapshot and snapshot.age < settings.news_feed_refresh_seconds:
+            self.snapshot_hits += 1
+            return snapshot
+        
+        task = self._refreshing.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh_feed(url))
+            self._refreshing[url] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(url, None))
+        else:
+            self.coalesced_refreshes += 1
+        
+        # Shielded: one caller giving up must not cancel everyone's refresh
+        return await asyncio.shield(task)
+    
+    async def _refresh_feed(self, url: str) -> Optional[FeedSnapshot]:
+        previous = self._snapshots.get(url)
+        snapshot = await self._fetch_feed(url, previous)
+        if snapshot is None:
+            # Serve the stale snapshot (if any) until the feed recovers
+            return previous
+        if snapshot is previous:
+            return snapshot  # 304: nothing to re-index
+        
+        self._snapshots[url] = snapshot
+        if url in self.rss_feeds['general']:
+            self.ticker_index.replace_feed(url, snapshot.source, snapshot.entries)
+            await self._ingest_general(snapshot)
+        
+        # Forget per-ticker feeds nobody has asked for in a while
+        max_age = settings.news_feed_refresh_seconds * 10
+        for stale_url in [u for u, s in self._snapshots.items() if s.age > max_age]:
+            del self._snapshots[stale_url]
+            self.ticker_index.remove_feed(stale_url)
+        return snapshot
+    
+    def stats(self) -> Dict:
+        return {
+            'snapshots': len(self._snapshots),
+            'refreshing': len(self._refreshing),
+            'feed_fetches': self.feed_fetches,
+            'snapshot_hits': self.snapshot_hits,
+            'coalesced_refreshes': self.coalesced_refreshes,
+            'not_modified': self.not_modified,
+            'new_entries': self.new_entries,
+            'refresh_seconds': settings.news_feed_refresh_seconds,
+            'ticker_index': self.ticker_index.stats()
+        }
     
     async def get_news_for_ticker(self, ticker: str, hours: int = 24) -> List[Dict]:
         '''
         Fetch recent news articles for a specific ticker.
         
+        Feeds are refreshed (at most once per interval) and anything new
+        is added to the ticker's article timeline; the answer is a window
+        read on that timeline, so any `hours` costs the same.
+        
         Args:
             ticker: Stock ticker symbol (e.g., 'AAPL')
             hours: How many hours back to fetch news
         
         Returns:
             List of news articles with headline, source, url, published_date
+            (newest first, one per headline)
         '''
         print(f'📰 Fetching news for {ticker}...')
         
-        articles = []
-        
         # Method 1: RSS Feeds (free, no API key needed)
-        articles.extend(await self._fetch_from_rss(ticker, hours))
-        
         # Method 2: Google News (as backup)
-        articles.extend(await self._fetch_from_google_news(ticker, hours))
+        # Both ingested concurrently
+        await asyncio.gather(
+            self._ingest_rss(ticker),
+            self._ingest_google_news(ticker)
+        )
         
-        # Remove duplicates (same headline)
-        seen_headlines = set()
-        unique_articles = []
-        for article in articles:
-            headline_lower = article['headline'].lower()
-            if headline_lower not in seen_headlines:
-                seen_headlines.add(headline_lower)
-                unique_articles.append(article)
+        articles = await article_timeline.window(ticker, hours, limit=settings.news_max_articles)
         
-        print(f'✅ Found {len(unique_articles)} unique articles for {ticker}')
-        return unique_articles[:20]  # Limit to 20 most recent
+        print(f'✅ Found {len(articles)} unique articles for {ticker}')
+        return articles
     
-    async def _fetch_from_rss(self, ticker: str, hours: int) -> List[Dict]:
-        '''Fetch from RSS feeds'''
-        articles = []
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        
+    async def _ingest_rss(self, ticker: str):
+        '''Bring the general RSS feeds up to date on the ticker's timeline'''
         try:
-            for feed_url in self.rss_feeds['general']:
-                feed = feedparser.parse(feed_url)
-                
-                for entry in feed.entries[:30]:  # Check first 30 entries
-                    # Check if article mentions the ticker
-                    title = entry.get('title', '')
-                    summary = entry.get('summary', '')
-                    
-                    if ticker.upper() in (title + summary).upper():
-                        # Parse published date
-                        pub_date = entry.get('published_parsed')
-                        if pub_date:
-                            pub_datetime = datetime(*pub_date[:6])
-                            if pub_datetime < cutoff_time:
-                                continue  # Too old
-                        
-                        articles.append({
-                            'headline': title,
-                            'source': feed.feed.get('title', 'RSS Feed'),
-                            'url': entry.get('link', ''),
-                            'published_date': pub_datetime.isoformat() if pub_date else datetime.utcnow().isoformat(),
-                            'summary': summary[:200] if summary else ''
-                        })
+            ticker = ticker.upper()
+            self.ticker_index.add_tickers([ticker])
+            # A refresh indexes its new entries and adds them to the timelines
+            await asyncio.gather(*[self._get_feed(url) for url in self.rss_feeds['general']])
+            
+            if ticker not in self._seeded:
+                # Entries indexed before this ticker was tracked
+                await article_timeline.add(ticker, [
+                    _to_article(source, entry) for source, entry in self.ticker_index.lookup(ticker)
+                ])
+                self._seeded.add(ticker)
         except Exception as e:
             print(f'⚠️  RSS fetch error: {e}')
+    
+    async def _ingest_general(self, snapshot: FeedSnapshot):
+        '''Add a general feed's new entries to the timeline of every ticker they mention.'''
+        by_ticker: Dict[str, List[Dict]] = {}
+        for guid in snapshot.new_guids:
+            entry = snapshot.by_guid[guid]
+            for ticker in self.ticker_index.match(entry['mention_keys']):
+                by_ticker.setdefault(ticker, []).append(_to_article(snapshot.source, entry))
         
-        return articles
+        await asyncio.gather(*[
+            article_timeline.add(ticker, articles) for ticker, articles in by_ticker.items()
+        ])
     
-    async def _fetch_from_google_news(self, ticker: str, hours: int) -> List[Dict]:
+    async def _ingest_google_news(self, ticker: str):
         '''Fetch from Google News RSS (free, no API key)'''
-        articles = []
-        
         try:
             # Google News RSS for specific ticker
+            ticker = ticker.upper()
             url = f'https://news.google.com/rss/search?q={ticker}+stock&hl=en-US&gl=US&ceid=US:en'
             
-            feed = feedparser.parse(url)
-            cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-            
-            for entry in feed.entries[:15]:
-                pub_date = entry.get('published_parsed')
-                if pub_date:
-                    pub_datetime = datetime(*pub_date[:6])
-                    if pub_datetime < cutoff_time:
-                        continue
-                else:
-                    pub_datetime = datetime.utcnow()
-                
-                articles.append({
-                    'headline': entry.get('title', ''),
-                    'source': entry.get('source', {}).get('title', 'Google News'),
-                    'url': entry.get('link', ''),
-                    'published_date': pub_datetime.isoformat(),
-                    'summary': entry.get('summary', '')[:200]
-                })
+            snapshot = await self._get_feed(url)
+            if snapshot is None:
+                return
+            if snapshot.ingest_task is None:
+                snapshot.ingest_task = asyncio.ensure_future(article_timeline.add(ticker, [
+                    _to_article(snapshot.by_guid[guid]['source'] or 'Google News', snapshot.by_guid[guid])
+                    for guid in snapshot.new_guids
+                ]))
+            # Requests arriving mid-ingest wait for it before reading the timeline
+            await asyncio.shield(snapshot.ingest_task)
         except Exception as e:
             print(f'⚠️  Google News fetch error: {e}')
-        
-        return articles
     
     async def get_batch_news(self, tickers: List[str], hours: int = 24) -> Dict[str, List[Dict]]:
         '''
@@ -132,7 +343,8 @@ class NewsService:
         '''
         print(f'📰 Batch fetching news for {len(tickers)} tickers...')
         
-        # Fetch all concurrently (async magic!)
+        # Fetch all concurrently (async magic!) - the general feeds are
+        # downloaded once and shared by every ticker
         tasks = [self.get_news_for_ticker(ticker, hours) for ticker in tickers]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
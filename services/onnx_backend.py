@@ -0,0 +1,45 @@
+"""
+ONNX Runtime backend for FinBERT.
+
+Runs a locally exported (and optionally int8-quantized) FinBERT graph with
+onnxruntime on CPU. Build the model with `python -m scripts.export_onnx`.
+"""
+
+import os
+from typing import Dict
+
+import numpy as np
+import onnxruntime as ort
+
+
+class OnnxSentimentModel:
+    """Thin wrapper around an onnxruntime session that returns logits."""
+
+    def __init__(self, model_path: str, intra_op_threads: int = 0):
+        '''
+        Args:
+            model_path: Path to the exported .onnx file
+            intra_op_threads: Threads per forward pass (0 = onnxruntime default)
+        '''
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f'ONNX model not found: {model_path}')
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=['CPUExecutionProvider']
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def __call__(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        '''Run a forward pass on tokenizer output (numpy) and return logits.'''
+        feed = {
+            name: np.asarray(encoded[name], dtype=np.int64)
+            for name in self.input_names
+        }
+        return self.session.run(['logits'], feed)[0]
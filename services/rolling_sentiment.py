@@ -0,0 +1,224 @@
+"""
+Rolling Sentiment State
+
+Per-ticker, exponentially time-decayed sentiment. Each newly scored article
+is folded in once, in O(1):
+
+    score_sum  = score_sum  * decay + score * confidence
+    weight_sum = weight_sum * decay + confidence
+    decay      = exp(-ln2 * (t - t_last) / half_life)
+
+Reading the state is also O(1), no matter how much news a ticker has:
+the decayed score is score_sum / weight_sum. State lives in a small Redis
+hash (updated atomically by a Lua script, so workers can share it) with an
+in-process fallback when Redis is unavailable.
+
+Applied articles are remembered by model id + headline hash (a headline
+re-scored by another model is folded in again), and only for the
+decay horizon, HORIZON_HALF_LIVES half-lives: articles older than that
+would carry less than 0.1% weight, so they are not applied at all and
+their ids are pruned. The seen set stays bounded by recent news volume.
+"""
+
+import math
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from api.config import get_settings
+from services.cache import CacheService, cache
+from services.sentiment_cache import content_hash
+
+settings = get_settings()
+
+# Articles older than this many half-lives are ignored (weight < 2**-10)
+HORIZON_HALF_LIVES = 10
+
+# KEYS: state hash, seen sorted set (article id -> published time)
+# ARGV: lambda, ttl, oldest time applied, then
+#       (article id, timestamp, score, confidence, label) per article
+UPDATE_SCRIPT = """
+local lambda = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local horizon = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 't', 'score_sum', 'weight_sum')
+local t0 = tonumber(state[1])
+local score_sum = tonumber(state[2]) or 0
+local weight_sum = tonumber(state[3]) or 0
+local applied = 0
+
+for i = 4, #ARGV, 5 do
+    local t = tonumber(ARGV[i + 1])
+    if t >= horizon and redis.call('ZADD', KEYS[2], 'NX', t, ARGV[i]) == 1 then
+        local weighted = tonumber(ARGV[i + 2]) * tonumber(ARGV[i + 3])
+        local weight = tonumber(ARGV[i + 3])
+        if t0 == nil then t0 = t end
+        if t >= t0 then
+            local decay = math.exp(-lambda * (t - t0))
+            score_sum = score_sum * decay + weighted
+            weight_sum = weight_sum * decay + weight
+            t0 = t
+        else
+            local decay = math.exp(-lambda * (t0 - t))
+            score_sum = score_sum + weighted * decay
+            weight_sum = weight_sum + weight * decay
+        end
+        redis.call('HINCRBY', KEYS[1], ARGV[i + 4], 1)
+        applied = applied + 1
+    end
+end
+
+if applied > 0 then
+    redis.call('HSET', KEYS[1], 't', t0, 'score_sum', score_sum, 'weight_sum', weight_sum)
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', '(' .. ARGV[3])
+redis.call('EXPIRE', KEYS[1], ttl)
+redis.call('EXPIRE', KEYS[2], ttl)
+return applied
+"""
+
+
+class RollingState:
+    """Decayed sums and label counts for one ticker (in-process tier)."""
+
+    __slots__ = ('t', 'score_sum', 'weight_sum', 'positive', 'negative', 'neutral', 'seen')
+
+    def __init__(self):
+        self.t: Optional[float] = None
+        self.score_sum = 0.0
+        self.weight_sum = 0.0
+        self.positive = 0
+        self.negative = 0
+        self.neutral = 0
+        self.seen: Dict[str, float] = {}  # article id -> published time
+
+    def update(self, t: float, score: float, confidence: float, label: str, decay_rate: float):
+        if self.t is None:
+            self.t = t
+        if t >= self.t:
+            decay = math.exp(-decay_rate * (t - self.t))
+            self.score_sum = self.score_sum * decay + score * confidence
+            self.weight_sum = self.weight_sum * decay + confidence
+            self.t = t
+        else:
+            # Late arrival: discount it to the current reference time
+            decay = math.exp(-decay_rate * (self.t - t))
+            self.score_sum += score * confidence * decay
+            self.weight_sum += confidence * decay
+        if label in ('positive', 'negative', 'neutral'):
+            setattr(self, label, getattr(self, label) + 1)
+
+
+class RollingSentimentStore:
+    """O(1) update/read of per-ticker decayed sentiment."""
+
+    def __init__(self, redis_cache: CacheService, half_life_hours: float, ttl_seconds: int):
+        self.redis_cache = redis_cache
+        self.decay_rate = math.log(2) / (half_life_hours * 3600)
+        self.horizon_seconds = HORIZON_HALF_LIVES * half_life_hours * 3600
+        self.ttl_seconds = ttl_seconds
+        self._local: Dict[str, RollingState] = {}
+
+    async def update(self, ticker: str, articles: List[Dict], sentiments: List[Dict]) -> int:
+        '''
+        Fold newly scored articles into the ticker's state. Articles that
+        were already applied (same normalized headline and model) or are
+        older than the decay horizon are skipped; a headline re-scored by a
+        different model is folded in again.
+
+        Args:
+            ticker: Stock ticker symbol
+            articles: Articles with 'headline' and 'published_date'
+            sentiments: Sentiment dictionaries, aligned with articles
+
+        Returns:
+            Number of articles applied
+        '''
+        ticker = ticker.upper()
+        updates = [
+            (f"{sent.get('model_id') or sent.get('method', '')}:{content_hash(article['headline'])}",
+             published_timestamp(article.get('published_date')),
+             sent.get('score', 0.0), sent.get('confidence', 0.5), sent['sentiment'])
+            for article, sent in zip(articles, sentiments)
+        ]
+        if not updates:
+            return 0
+        horizon = time.time() - self.horizon_seconds
+
+        if self.redis_cache.redis_client:
+            args = [self.decay_rate, self.ttl_seconds, horizon]
+            for update in updates:
+                args.extend(update)
+            applied = await self.redis_cache.run_script(
+                UPDATE_SCRIPT,
+                keys=[self.redis_cache.rolling_sentiment_key(ticker),
+                      self.redis_cache.rolling_seen_key(ticker)],
+                args=args
+            )
+            if applied is not None:
+                return int(applied)
+
+        state = self._local.setdefault(ticker, RollingState())
+        applied = 0
+        for article_id, t, score, confidence, label in updates:
+            if t < horizon or article_id in state.seen:
+                continue
+            state.seen[article_id] = t
+            state.update(t, score, confidence, label, self.decay_rate)
+            applied += 1
+        state.seen = {article_id: t for article_id, t in state.seen.items() if t >= horizon}
+        return applied
+
+    async def read(self, ticker: str) -> Optional[Dict]:
+        '''
+        Current decayed sentiment for a ticker (None if nothing seen yet).
+
+        'score' is the recency-weighted average; 'weight' is the decayed
+        total confidence as of now, i.e. how much fresh evidence there is.
+        '''
+        ticker = ticker.upper()
+        fields = await self.redis_cache.hgetall(self.redis_cache.rolling_sentiment_key(ticker))
+        if fields:
+            t = float(fields.get('t', 0))
+            score_sum = float(fields.get('score_sum', 0))
+            weight_sum = float(fields.get('weight_sum', 0))
+            counts = {label: int(fields.get(label, 0)) for label in ('positive', 'negative', 'neutral')}
+        else:
+            state = self._local.get(ticker)
+            if state is None or state.t is None:
+                return None
+            t, score_sum, weight_sum = state.t, state.score_sum, state.weight_sum
+            counts = {'positive': state.positive, 'negative': state.negative, 'neutral': state.neutral}
+
+        if weight_sum <= 0:
+            return None
+
+        decay = math.exp(-self.decay_rate * max(time.time() - t, 0.0))
+        return {
+            'score': round(score_sum / weight_sum, 3),
+            'weight': round(weight_sum * decay, 3),
+            'article_count': sum(counts.values()),
+            'positive_count': counts['positive'],
+            'negative_count': counts['negative'],
+            'neutral_count': counts['neutral'],
+            'last_article_at': datetime.fromtimestamp(t, tz=timezone.utc).isoformat()
+        }
+
+
+def published_timestamp(published_date: Optional[str]) -> float:
+    '''Unix time of an article's published_date (naive ISO strings are UTC).'''
+    try:
+        published = datetime.fromisoformat(published_date.rstrip('Z'))
+    except (AttributeError, ValueError):
+        return time.time()
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published.timestamp()
+
+
+# Global instance
+rolling_sentiment = RollingSentimentStore(
+    cache,
+    half_life_hours=settings.sentiment_half_life_hours,
+    ttl_seconds=settings.rolling_state_ttl_seconds
+)
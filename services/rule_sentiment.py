@@ -0,0 +1,153 @@
+"""
+Fast rule-based sentiment engine.
+
+One precompiled regex alternation over a small financial lexicon, with
+word boundaries (so 'up' no longer matches 'supply' and 'cut' no longer
+matches 'executive') and multi-word phrases. Used as the fallback when the
+model is unavailable and as an explicit fast path (sentiment_backend='rules').
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+# Lexicon: term -> stem. Inflections share a stem so each stem counts once per text.
+POSITIVE_TERMS = {
+    'profit': 'profit', 'profits': 'profit', 'profitable': 'profit',
+    'gain': 'gain', 'gains': 'gain', 'gained': 'gain',
+    'growth': 'growth', 'grow': 'growth', 'grows': 'growth',
+    'up': 'up',
+    'rise': 'rise', 'rises': 'rise', 'rising': 'rise', 'rose': 'rise',
+    'high': 'high', 'higher': 'high', 'highs': 'high',
+    'beat': 'beat', 'beats': 'beat',
+    'exceed': 'exceed', 'exceeds': 'exceed', 'exceeded': 'exceed',
+    'strong': 'strong', 'stronger': 'strong',
+    'record': 'record',
+    'success': 'success', 'successful': 'success',
+    'positive': 'positive',
+    'bull': 'bull', 'bullish': 'bull',
+    'upgrade': 'upgrade', 'upgrades': 'upgrade', 'upgraded': 'upgrade',
+    'outperform': 'outperform', 'outperforms': 'outperform',
+    'revenue': 'revenue',
+    'earnings beat': 'earnings beat',
+}
+
+NEGATIVE_TERMS = {
+    'loss': 'loss', 'losses': 'loss',
+    'decline': 'decline', 'declines': 'decline', 'declined': 'decline',
+    'down': 'down',
+    'fall': 'fall', 'falls': 'fall', 'fell': 'fall', 'falling': 'fall',
+    'drop': 'drop', 'drops': 'drop', 'dropped': 'drop',
+    'low': 'low', 'lower': 'low', 'lows': 'low',
+    'miss': 'miss', 'misses': 'miss', 'missed': 'miss',
+    'weak': 'weak', 'weaker': 'weak',
+    'bear': 'bear', 'bearish': 'bear',
+    'downgrade': 'downgrade', 'downgrades': 'downgrade', 'downgraded': 'downgrade',
+    'underperform': 'underperform', 'underperforms': 'underperform',
+    'lawsuit': 'lawsuit', 'lawsuits': 'lawsuit',
+    'fraud': 'fraud',
+    'scandal': 'scandal',
+    'bankruptcy': 'bankruptcy',
+    'layoff': 'layoff', 'layoffs': 'layoff',
+    'cut': 'cut', 'cuts': 'cut',
+}
+
+
+class RuleBasedSentiment:
+    """Lexicon scorer backed by a single compiled regex."""
+
+    def __init__(self):
+        self._polarity: Dict[str, Tuple[int, str]] = {}
+        for term, stem in POSITIVE_TERMS.items():
+            self._polarity[term] = (1, stem)
+        for term, stem in NEGATIVE_TERMS.items():
+            self._polarity[term] = (-1, stem)
+
+        # Longest terms first so phrases win over their component words
+        terms = sorted(self._polarity, key=len, reverse=True)
+        self._pattern = re.compile(
+            r'\b(?:' + '|'.join(re.escape(t) for t in terms) + r')\b'
+        )
+
+    def counts(self, texts: List[str]) -> List[Tuple[int, int]]:
+        '''
+        Count distinct positive/negative stems per text.
+
+        All texts are joined and scanned with one finditer call; match
+        offsets are mapped back to their text with a binary search.
+        '''
+        # Lowercase per text: lower() can change a string's length
+        lowered = [text.lower() for text in texts]
+        starts = []
+        offset = 0
+        for text in lowered:
+            starts.append(offset)
+            offset += len(text) + 1
+
+        joined = '\n'.join(lowered)
+        found: List[set] = [set() for _ in texts]
+        for match in self._pattern.finditer(joined):
+            index = bisect_right(starts, match.start()) - 1
+            found[index].add(self._polarity[match.group()])
+
+        return [
+            (sum(1 for sign, _ in hits if sign > 0), sum(1 for sign, _ in hits if sign < 0))
+            for hits in found
+        ]
+
+    def score(self, text: str) -> Dict:
+        '''Score a single text.'''
+        return self.score_batch([text])[0]
+
+    def score_batch(self, texts: List[str]) -> List[Dict]:
+        '''Score many texts in one regex pass.'''
+        return [
+            self._build_result(text, pos_count, neg_count)
+            for text, (pos_count, neg_count) in zip(texts, self.counts(texts))
+        ]
+
+    def score_batch_with_confidence(self, texts: List[str]) -> Tuple[List[Dict], List[float]]:
+        '''
+        Score many texts and say how sure the lexicon is about each call
+        (used by the cascade to decide what to send on to the model).
+        '''
+        counts = self.counts(texts)
+        results = [self._build_result(text, pos, neg) for text, (pos, neg) in zip(texts, counts)]
+        return results, [self.confidence(pos, neg) for pos, neg in counts]
+
+    @staticmethod
+    def confidence(pos_count: int, neg_count: int) -> float:
+        '''
+        0 with no hits or a tie, higher with more hits that agree:
+        one clear hit -> 0.5, two -> 0.75, 2 vs 1 -> 0.29.
+        '''
+        hits = pos_count + neg_count
+        if hits == 0:
+            return 0.0
+        agreement = abs(pos_count - neg_count) / hits
+        return agreement * (1 - 0.5 ** hits)
+
+    @staticmethod
+    def _build_result(text: str, pos_count: int, neg_count: int) -> Dict:
+        # Determine sentiment
+        if pos_count > neg_count:
+            sentiment = 'positive'
+            score = min(pos_count * 0.3, 1.0)
+        elif neg_count > pos_count:
+            sentiment = 'negative'
+            score = -min(neg_count * 0.3, 1.0)
+        else:
+            sentiment = 'neutral'
+            score = 0.0
+
+        return {
+            'text': text[:100],
+            'sentiment': sentiment,
+            'score': round(score, 3),
+            'confidence': 0.5,  # Lower confidence for rule-based
+            'method': 'rule-based'
+        }
+
+
+# Global instance (pattern is compiled once per process)
+rule_sentiment = RuleBasedSentiment()
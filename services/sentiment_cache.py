@@ -0,0 +1,135 @@
+"""
+Headline Sentiment Cache
+
+Content-addressed cache for per-headline sentiment results.
+
+Results are keyed by a hash of the normalized headline plus the model id,
+so the same headline is scored once no matter which ticker or endpoint
+asked for it. Two tiers:
+- In-process LRU (bounded size, TTL) - no network round trip
+- Redis (via CacheService) - shared across workers and restarts
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from api.config import get_settings
+from services.cache import CacheService, cache
+
+settings = get_settings()
+
+
+def normalize_headline(text: str) -> str:
+    """Lowercase and collapse whitespace so trivial variants share a key."""
+    return ' '.join(text.lower().split())
+
+
+def content_hash(text: str) -> str:
+    """Model-independent hash of a normalized headline (article identity)."""
+    return hashlib.sha1(normalize_headline(text).encode('utf-8')).hexdigest()
+
+
+def headline_digest(text: str, model_id: str) -> str:
+    """Content hash of a normalized headline for a given model."""
+    payload = f"{model_id}\n{normalize_headline(text)}"
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """Two-tier (LRU + Redis) cache of headline sentiment results."""
+
+    def __init__(self, redis_cache: CacheService, max_size: int, ttl_seconds: int):
+        self.redis_cache = redis_cache
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._local: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+        # Hit/miss counters
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _get_local(self, digest: str) -> Optional[Dict]:
+        entry = self._local.get(digest)
+        if entry is None:
+            return None
+
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._local[digest]
+            return None
+
+        self._local.move_to_end(digest)
+        return result
+
+    def _set_local(self, digest: str, result: Dict):
+        self._local[digest] = (time.monotonic() + self.ttl_seconds, result)
+        self._local.move_to_end(digest)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    async def get_many(self, digests: List[str]) -> Dict[str, Dict]:
+        """
+        Look up several digests, LRU first, then Redis in one round trip.
+
+        Returns:
+            Dictionary mapping digest -> cached result (misses are absent)
+        """
+        found = {}
+        remote = []
+
+        for digest in digests:
+            result = self._get_local(digest)
+            if result is not None:
+                found[digest] = result
+                self.local_hits += 1
+            else:
+                remote.append(digest)
+
+        if remote:
+            keys = [self.redis_cache.headline_sentiment_key(d) for d in remote]
+            values = await self.redis_cache.get_many(keys)
+            for digest, value in zip(remote, values):
+                if value is None:
+                    self.misses += 1
+                    continue
+                found[digest] = value
+                self._set_local(digest, value)
+                self.redis_hits += 1
+
+        return found
+
+    async def set_many(self, results: Dict[str, Dict]):
+        """Store freshly scored results in both tiers."""
+        if not results:
+            return
+
+        for digest, result in results.items():
+            self._set_local(digest, result)
+
+        await self.redis_cache.set_many(
+            {self.redis_cache.headline_sentiment_key(d): r for d, r in results.items()},
+            ttl=self.ttl_seconds
+        )
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current LRU size."""
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            'local_size': len(self._local),
+            'max_size': self.max_size,
+            'local_hits': self.local_hits,
+            'redis_hits': self.redis_hits,
+            'misses': self.misses,
+            'hit_rate': round((lookups - self.misses) / lookups, 3) if lookups else 0.0
+        }
+
+
+# Global instance
+sentiment_cache = SentimentCache(
+    cache,
+    max_size=settings.sentiment_cache_size,
+    ttl_seconds=settings.sentiment_cache_ttl_seconds
+)
@@ -0,0 +1,261 @@
+"""
+Sentiment History Store
+
+Writes every scored headline to the SentimentHistory table and serves it
+back as a durable memo of past inference work: SentimentService checks it
+for headlines the sentiment cache no longer has (restart, eviction)
+before running the model.
+
+Writes are buffered in memory and flushed as one bulk
+INSERT ... ON CONFLICT DO UPDATE per batch, keyed by
+(ticker, content hash, model id), so re-scoring a headline updates its
+row instead of adding a duplicate. Database calls run in a thread so the
+event loop never blocks on Postgres; if the database is unreachable the
+store backs off and scoring carries on without it.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from api.config import get_settings
+from services.rolling_sentiment import published_timestamp
+from services.sentiment_cache import content_hash
+
+settings = get_settings()
+
+
+class SentimentHistoryStore:
+    """Buffered bulk upserts into SentimentHistory plus memo lookups."""
+
+    def __init__(self, enabled: bool, flush_size: int, flush_interval_seconds: float,
+                 max_buffer: int, retry_seconds: float = 30.0):
+        self.enabled = enabled
+        self.flush_size = flush_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffer = max_buffer
+        self.retry_seconds = retry_seconds
+
+        # (ticker, content_hash, model_id) -> row; later scores replace earlier ones
+        self._buffer: Dict[Tuple[str, str, str], Dict] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._timer_task: Optional[asyncio.Task] = None
+        self._retry_at = 0.0
+
+        # Metrics
+        self.rows_written = 0
+        self.flushes = 0
+        self.dropped = 0
+        self.lookups = 0
+        self.hits = 0
+        self.errors = 0
+
+    @property
+    def available(self) -> bool:
+        return self.enabled and time.monotonic() >= self._retry_at
+
+    def record(self, ticker: str, articles: List[Dict], sentiments: List[Dict]) -> int:
+        '''
+        Buffer scored headlines for the next bulk upsert.
+
+        Pooled headline+summary results (chunks > 1) are not a headline
+        score and are skipped, as are results with no model id.
+
+        Args:
+            ticker: Stock ticker symbol
+            articles: Articles with 'headline', 'source', 'published_date'
+            sentiments: Sentiment dictionaries, aligned with articles
+
+        Returns:
+            Number of rows buffered
+        '''
+        if not self.enabled:
+            return 0
+
+        ticker = ticker.upper()
+        buffered = 0
+        for article, sent in zip(articles, sentiments):
+            model_id = sent.get('model_id') or ('rule-based' if sent.get('method') == 'rule-based' else None)
+            if model_id is None or sent.get('chunks', 1) > 1:
+                continue
+
+            key = (ticker, content_hash(article['headline']), model_id)
+            if key not in self._buffer and len(self._buffer) >= self.max_buffer:
+                self.dropped += 1
+                continue
+
+            self._buffer[key] = {
+                'ticker': ticker,
+                'headline': article['headline'],
+                'content_hash': key[1],
+                'model_id': model_id,
+                'source': (article.get('source') or '')[:100] or None,
+                'published_at': datetime.fromtimestamp(
+                    published_timestamp(article.get('published_date')), tz=timezone.utc
+                ),
+                'sentiment_score': sent.get('score', 0.0),
+                'sentiment_label': sent['sentiment'],
+                'sentiment_confidence': sent.get('confidence'),
+                'probabilities': sent.get('probabilities')
+            }
+            buffered += 1
+
+        if len(self._buffer) >= self.flush_size and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        return buffered
+
+    async def flush(self) -> int:
+        '''Upsert everything buffered so far. Returns rows written.'''
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            if not self._buffer or not self.available:
+                return 0
+
+            rows, self._buffer = list(self._buffer.values()), {}
+            written = 0
+            try:
+                for start in range(0, len(rows), self.flush_size):
+                    chunk = rows[start:start + self.flush_size]
+                    await asyncio.to_thread(self._write, chunk)
+                    written += len(chunk)
+            except Exception as e:
+                self.errors += 1
+                self._retry_at = time.monotonic() + self.retry_seconds
+                print(f'❌ Sentiment history flush error: {e}')
+                # Put unwritten rows back (newer buffered scores win)
+                for row in rows[written:]:
+                    key = (row['ticker'], row['content_hash'], row['model_id'])
+                    if len(self._buffer) < self.max_buffer:
+                        self._buffer.setdefault(key, row)
+                    else:
+                        self.dropped += 1
+
+            self.rows_written += written
+            self.flushes += 1
+            return written
+
+    async def lookup(self, texts: Dict[str, str], model_id: str) -> Dict[str, Dict]:
+        '''
+        Previously stored results for texts scored by model_id.
+
+        Args:
+            texts: Caller's key -> headline text
+            model_id: Model the results must come from
+
+        Returns:
+            Dictionary mapping caller's key -> sentiment dictionary (misses absent)
+        '''
+        if not texts or not self.available:
+            return {}
+
+        hashes = {key: content_hash(text) for key, text in texts.items()}
+        self.lookups += 1
+        try:
+            rows = await asyncio.to_thread(self._read, list(set(hashes.values())), model_id)
+        except Exception as e:
+            self.errors += 1
+            self._retry_at = time.monotonic() + self.retry_seconds
+            print(f'❌ Sentiment history lookup error: {e}')
+            return {}
+
+        found = {}
+        for key, digest in hashes.items():
+            row = rows.get(digest)
+            if row is None:
+                continue
+            result = {
+                'text': texts[key][:100],
+                'sentiment': row.sentiment_label,
+                'score': row.sentiment_score,
+                'confidence': row.sentiment_confidence if row.sentiment_confidence is not None else 0.5
+            }
+            if row.probabilities:
+                result['probabilities'] = row.probabilities
+            if model_id == 'rule-based':
+                result['method'] = 'rule-based'
+            found[key] = result
+        self.hits += len(found)
+        return found
+
+    def _write(self, rows: List[Dict]):
+        from sqlalchemy.dialects.postgresql import insert
+        from sqlalchemy.sql import func
+        from models.database import engine, SentimentHistory
+
+        stmt = insert(SentimentHistory).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_ticker_content_model',
+            set_={
+                'sentiment_score': stmt.excluded.sentiment_score,
+                'sentiment_label': stmt.excluded.sentiment_label,
+                'sentiment_confidence': stmt.excluded.sentiment_confidence,
+                'probabilities': stmt.excluded.probabilities,
+                'source': func.coalesce(stmt.excluded.source, SentimentHistory.source),
+                'published_at': func.coalesce(SentimentHistory.published_at, stmt.excluded.published_at)
+            }
+        )
+        with engine.begin() as conn:
+            conn.execute(stmt)
+
+    def _read(self, hashes: List[str], model_id: str) -> Dict:
+        from sqlalchemy import select
+        from models.database import engine, SentimentHistory
+
+        stmt = (
+            select(
+                SentimentHistory.content_hash,
+                SentimentHistory.sentiment_label,
+                SentimentHistory.sentiment_score,
+                SentimentHistory.sentiment_confidence,
+                SentimentHistory.probabilities
+            )
+            .where(SentimentHistory.content_hash.in_(hashes), SentimentHistory.model_id == model_id)
+            .distinct(SentimentHistory.content_hash)
+        )
+        with engine.connect() as conn:
+            return {row.content_hash: row for row in conn.execute(stmt)}
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+    def start(self):
+        if self.enabled and self._timer_task is None:
+            self._timer_task = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def stop(self):
+        if self._timer_task:
+            self._timer_task.cancel()
+            self._timer_task = None
+        if self._flush_task and not self._flush_task.done():
+            await self._flush_task
+        # Last chance to persist what's buffered
+        self._retry_at = 0.0
+        await self.flush()
+
+    def stats(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            'available': self.available,
+            'buffered': len(self._buffer),
+            'rows_written': self.rows_written,
+            'flushes': self.flushes,
+            'dropped': self.dropped,
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'errors': self.errors
+        }
+
+
+# Global instance
+sentiment_history = SentimentHistoryStore(
+    enabled=settings.sentiment_history_enabled,
+    flush_size=settings.sentiment_history_flush_size,
+    flush_interval_seconds=settings.sentiment_history_flush_interval_seconds,
+    max_buffer=settings.sentiment_history_max_buffer
+)
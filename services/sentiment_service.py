@@ -1,44 +1,192 @@
 ﻿"""
 Sentiment analysis service using FinBERT.
 FinBERT is a BERT model fine-tuned on financial news for sentiment analysis.
+
+torch/transformers are imported only when a model backend is loaded, so
+importing this module (API workers, Celery, tests, rule-based-only nodes)
+stays fast. Check with `python -m scripts.import_report`.
 """
 
+import asyncio
+import functools
+import os
+import random
+import threading
+import time
 from typing import List, Dict, Optional
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
 import numpy as np
 
+from api.config import get_settings
+from services.sentiment_cache import sentiment_cache, headline_digest
+from services.inference_queue import MicroBatcher, DEFAULT_PRIORITY
+from services.inference_executor import inference_executor
+from services.rule_sentiment import rule_sentiment
+from services.inference_client import inference_client
+from services.model_bundle import load_manifest, bundle_id, file_sha256
+from services.sentiment_history import sentiment_history
+from utils.headlines import SAMPLE_HEADLINES
+
+settings = get_settings()
+
+# Column of each label in probability rows and count arrays
+LABEL_INDEX = {'negative': 0, 'neutral': 1, 'positive': 2}
+UNKNOWN_LABEL = 3
+
+def _summary_windows(summary: str, headline: str, size: int) -> List[str]:
+    '''Split a summary into windows of `size` words, skipping a repeat of the headline.'''
+    words = summary.split()
+    if not words or ' '.join(words).lower() == ' '.join(headline.split()).lower():
+        return []
+    return [' '.join(words[i:i + size]) for i in range(0, len(words), size)]
+
 class SentimentService:
     def __init__(self):
         self.model = None
         self.tokenizer = None
         self.model_loaded = False
+        self.model_name = 'ProsusAI/finbert'
+        self.manifest = None  # set when loaded from a local model bundle
+        self.artifact_version = None  # content hash of the ONNX/student file
+        
+        # Cascade mode: rule-based first stage, model only for unsure texts
+        self.cascade = settings.sentiment_cascade
+        self.cascade_threshold = settings.cascade_threshold
+        self.cascade_metrics = {'texts': 0, 'escalated': 0, 'audited': 0, 'audit_agreed': 0}
+        
+        # False only while an eager preload/warmup is running (see preload)
+        self.ready = True
+        
+        # One load at a time across executor threads, and one shared
+        # in-flight load for concurrent cold-start requests
+        self._load_lock = threading.Lock()
+        self._loading: Optional[asyncio.Future] = None
+        
+        # Inference backend: 'torch' (default), 'onnx' (quantized, CPU),
+        # 'student' (distilled linear model) or 'rules' (compiled lexicon
+        # only - no model is ever loaded)
+        self.backend = settings.sentiment_backend
+        
+        # Cross-request batching front-end for analyze_batch
+        self.batcher = MicroBatcher(
+            self.analyze_batch,
+            inference_executor,
+            window_ms=settings.inference_batch_window_ms,
+            max_batch_size=settings.inference_max_batch_size,
+            max_queue_size=settings.inference_max_queue_size,
+            starvation_ms=settings.inference_starvation_ms
+        )
         
         # Sentiment labels
         self.labels = ['negative', 'neutral', 'positive']
     
     def load_model(self):
         '''Load FinBERT model (lazy loading - only when needed)'''
-        if self.model_loaded:
+        if self.model_loaded or self.backend == 'rules':
             return
-        
-        print(' Loading FinBERT model...')
+        with self._load_lock:
+            if not self.model_loaded:
+                self._load_model()
+    
+    def _load_model(self):
+        print(f' Loading sentiment model ({self.backend} backend)...')
         try:
-            # FinBERT model from HuggingFace
-            model_name = 'ProsusAI/finbert'
-            
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
-            
-            # Set to evaluation mode
-            self.model.eval()
+            if self.backend == 'onnx':
+                self._load_onnx()
+            elif self.backend == 'torch':
+                self._load_torch()
+            elif self.backend == 'student':
+                self._load_student()
+            else:
+                raise ValueError(f'Unknown sentiment backend: {self.backend}')
             
             self.model_loaded = True
-            print(' FinBERT model loaded successfully')
+            print(f' Sentiment model loaded successfully ({self.model_id})')
         except Exception as e:
             print(f' Error loading model: {e}')
             print('  Falling back to rule-based sentiment')
     
+    def preload(self, batch_sizes: List[int]):
+        '''
+        Load the model eagerly and warm it up (run at startup). Marks the
+        service ready when done, also if loading fell back to rule-based.
+        '''
+        self.load_model()
+        if self.model_loaded:
+            self.warmup(batch_sizes)
+        self.ready = True
+    
+    def warmup(self, batch_sizes: List[int]):
+        '''
+        Run a forward pass for each typical batch shape so first requests
+        don't pay for lazy allocations and kernel selection.
+        '''
+        for size in batch_sizes:
+            texts = [SAMPLE_HEADLINES[i % len(SAMPLE_HEADLINES)] for i in range(size)]
+            start = time.perf_counter()
+            self._analyze_model(texts, batch_size=size)
+            print(f'  Warmup batch={size}: {(time.perf_counter() - start) * 1000:.1f}ms')
+    
+    def _load_torch(self):
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        
+        from_bundle = bool(settings.sentiment_model_path)
+        if from_bundle:
+            # Local bundle (scripts.build_model_bundle): never touches the hub,
+            # safetensors weights are memory-mapped instead of unpickled
+            self.manifest = load_manifest(settings.sentiment_model_path)
+            source = settings.sentiment_model_path
+            options = {'use_safetensors': True, 'low_cpu_mem_usage': True}
+        else:
+            # FinBERT model from HuggingFace
+            source, options = self.model_name, {}
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(source, local_files_only=from_bundle)
+        self.model = AutoModelForSequenceClassification.from_pretrained(
+            source, local_files_only=from_bundle, **options
+        )
+        
+        # Set to evaluation mode
+        self.model.eval()
+    
+    def _load_onnx(self):
+        # Exported graph + tokenizer saved next to it by scripts.export_onnx
+        from transformers import AutoTokenizer
+        from services.onnx_backend import OnnxSentimentModel
+        
+        model_dir = os.path.dirname(settings.onnx_model_path)
+        self.artifact_version = file_sha256(settings.onnx_model_path)[:12]
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+        self.model = OnnxSentimentModel(
+            settings.onnx_model_path,
+            intra_op_threads=settings.onnx_intra_op_threads
+        )
+    
+    def _load_student(self):
+        # Distilled hashed n-gram model from scripts.distill_student (no torch)
+        from services.student_model import StudentModel
+        
+        self.model = StudentModel.load(settings.student_model_path)
+        self.artifact_version = file_sha256(settings.student_model_path)[:12]
+    
+    @property
+    def model_id(self) -> str:
+        '''Identifier of whatever is producing scores (part of the cache key)'''
+        if not self.model_loaded:
+            return 'rule-based'
+        if self.backend == 'onnx':
+            # Content version, so a re-exported file at the same path gets a new id
+            model_id = (f'{self.model_name}:onnx:{os.path.basename(settings.onnx_model_path)}'
+                        f'@{self.artifact_version}')
+        elif self.backend == 'student':
+            model_id = f'student:{os.path.basename(settings.student_model_path)}@{self.artifact_version}'
+        elif self.manifest:
+            model_id = bundle_id(self.manifest)
+        else:
+            model_id = self.model_name
+        if self.cascade:
+            model_id += f'+cascade@{self.cascade_threshold}'
+        return model_id
+    
     def analyze_sentiment(self, text: str) -> Dict:
         '''
         Analyze sentiment of a single text.
@@ -63,52 +211,8 @@ class SentimentService:
             return self._rule_based_sentiment(text)
         
         try:
-            # Tokenize
-            inputs = self.tokenizer(
-                text,
-                return_tensors='pt',
-                truncation=True,
-                max_length=512,
-                padding=True
-            )
-            
-            # Get prediction
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-            
-            # Get probabilities
-            probs = predictions[0].numpy()
-            
-            # Get predicted class
-            predicted_class = np.argmax(probs)
-            sentiment_label = self.labels[predicted_class]
-            confidence = float(probs[predicted_class])
-            
-            # Convert to score: -1 (negative) to +1 (positive)
-            # negative=0, neutral=1, positive=2
-            score = (predicted_class - 1) / 1.0  # Maps to [-1, 0, 1]
-            
-            # Adjust score by confidence
-            # e.g., if neutral with 60% confidence, score closer to 0
-            if sentiment_label == 'neutral':
-                score = 0.0
-            elif sentiment_label == 'positive':
-                score = confidence  # 0.5 to 1.0
-            else:  # negative
-                score = -confidence  # -1.0 to -0.5
-            
-            return {
-                'text': text[:100],  # First 100 chars
-                'sentiment': sentiment_label,
-                'score': round(score, 3),
-                'confidence': round(confidence, 3),
-                'probabilities': {
-                    'negative': round(float(probs[0]), 3),
-                    'neutral': round(float(probs[1]), 3),
-                    'positive': round(float(probs[2]), 3)
-                }
-            }
+            probs = self._predict_probs([text])[0]
+            return self._build_result(text, probs)
             
         except Exception as e:
             print(f' Sentiment analysis error: {e}')
@@ -118,6 +222,12 @@ class SentimentService:
         '''
         Analyze sentiment for multiple texts (more efficient).
         
+        Texts are tokenized once, sorted by token length and cut into chunks
+        of `batch_size`, so each chunk is only padded to its own longest row.
+        Each chunk is scored in a single forward pass and results come back
+        in the original order. If a chunk fails, its texts are retried one at
+        a time so a single bad input still falls back to rule-based sentiment.
+        
         Args:
             texts: List of texts to analyze
             batch_size: Number of texts to process at once
@@ -125,59 +235,344 @@ class SentimentService:
         Returns:
             List of sentiment dictionaries
         '''
-        results = []
+        if not texts:
+            return []
+        
+        # Load model if not already loaded
+        if not self.model_loaded:
+            self.load_model()
+        
+        if not self.model_loaded:
+            return rule_sentiment.score_batch(texts)
+        
+        if self.cascade:
+            return self._analyze_cascade(texts, batch_size)
+        
+        return self._analyze_model(texts, batch_size)
+    
+    def _analyze_model(self, texts: List[str], batch_size: int) -> List[Dict]:
+        '''Score texts with the loaded model in length-bucketed batches.'''
+        if self.backend == 'student':
+            # No padding involved: one sparse matrix product for everything
+            try:
+                probs = self.model.predict_proba(texts)
+                return [self._build_result(text, row) for text, row in zip(texts, probs)]
+            except Exception as e:
+                print(f' Student sentiment error ({len(texts)} texts): {e}')
+                return [self.analyze_sentiment(text) for text in texts]
+        
+        try:
+            encoded = self._tokenize(texts)
+        except Exception as e:
+            print(f' Batch tokenization error ({len(texts)} texts): {e}')
+            return [self.analyze_sentiment(text) for text in texts]
+        
+        # Bucket by token length so padding stays within each chunk's max
+        lengths = [len(ids) for ids in encoded['input_ids']]
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+        results: List[Optional[Dict]] = [None] * len(texts)
         
         # Process in batches
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            for text in batch:
-                results.append(self.analyze_sentiment(text))
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            try:
+                probs = self._forward({
+                    key: [values[i] for i in chunk] for key, values in encoded.items()
+                })
+                for i, row in zip(chunk, probs):
+                    results[i] = self._build_result(texts[i], row)
+            except Exception as e:
+                print(f' Batch sentiment error ({len(chunk)} texts): {e}')
+                for i in chunk:
+                    results[i] = self.analyze_sentiment(texts[i])
         
         return results
     
-    def _rule_based_sentiment(self, text: str) -> Dict:
+    def _analyze_cascade(self, texts: List[str], batch_size: int) -> List[Dict]:
         '''
-        Simple rule-based sentiment (fallback when model unavailable).
+        Cheap first stage for every text; only texts the lexicon is unsure
+        about (confidence < cascade_threshold) go on to the model. A random
+        sample of accepted texts is also scored by the model to track how
+        often the first stage agrees with it.
         '''
-        text_lower = text.lower()
+        results, confidences = rule_sentiment.score_batch_with_confidence(texts)
         
-        # Positive words
-        positive_words = [
-            'profit', 'gain', 'growth', 'up', 'rise', 'high', 'beat',
-            'exceed', 'strong', 'record', 'success', 'positive', 'bull',
-            'upgrade', 'outperform', 'revenue', 'earnings beat'
-        ]
+        escalate = [i for i, conf in enumerate(confidences) if conf < self.cascade_threshold]
+        accepted = [i for i, conf in enumerate(confidences) if conf >= self.cascade_threshold]
+        audit = [i for i in accepted if random.random() < settings.cascade_audit_rate]
         
-        # Negative words
-        negative_words = [
-            'loss', 'decline', 'down', 'fall', 'drop', 'low', 'miss',
-            'weak', 'bear', 'downgrade', 'underperform', 'lawsuit',
-            'fraud', 'scandal', 'bankruptcy', 'layoff', 'cut'
-        ]
+        to_model = escalate + audit
+        model_results = self._analyze_model([texts[i] for i in to_model], batch_size) if to_model else []
+        
+        for i, result in zip(escalate, model_results):
+            results[i] = result
+        for i in accepted:
+            results[i]['method'] = 'cascade-rules'
+            results[i]['confidence'] = round(confidences[i], 3)
         
-        # Count sentiment words
-        pos_count = sum(1 for word in positive_words if word in text_lower)
-        neg_count = sum(1 for word in negative_words if word in text_lower)
-        
-        # Determine sentiment
-        if pos_count > neg_count:
-            sentiment = 'positive'
-            score = min(pos_count * 0.3, 1.0)
-        elif neg_count > pos_count:
-            sentiment = 'negative'
-            score = -min(neg_count * 0.3, 1.0)
+        # Metrics
+        self.cascade_metrics['texts'] += len(texts)
+        self.cascade_metrics['escalated'] += len(escalate)
+        self.cascade_metrics['audited'] += len(audit)
+        self.cascade_metrics['audit_agreed'] += sum(
+            1 for i, result in zip(audit, model_results[len(escalate):])
+            if result['sentiment'] == results[i]['sentiment']
+        )
+        
+        return results
+    
+    def cascade_stats(self) -> Dict:
+        '''Escalation rate and first-stage/model agreement for cascade mode.'''
+        m = self.cascade_metrics
+        return {
+            'enabled': self.cascade,
+            'threshold': self.cascade_threshold,
+            'texts': m['texts'],
+            'escalated': m['escalated'],
+            'escalation_rate': round(m['escalated'] / m['texts'], 3) if m['texts'] else 0.0,
+            'audited': m['audited'],
+            'audit_agreement': round(m['audit_agreed'] / m['audited'], 3) if m['audited'] else None
+        }
+    
+    async def analyze_batch_cached(self, texts: List[str], priority: str = DEFAULT_PRIORITY) -> List[Dict]:
+        '''
+        Like analyze_batch, but consults the headline sentiment cache first
+        and only runs inference on headlines that have not been scored yet.
+        Misses go to the standalone inference server when one is configured
+        (inference_server_url), otherwise through the in-process
+        micro-batching queue, so concurrent requests share forward passes.
+        Inference runs on the inference executor, never on the event loop.
+        
+        Args:
+            texts: List of texts to analyze
+            priority: Queue class - 'interactive' (user-facing requests),
+                'scan' (multi-ticker scans) or 'background' (bulk jobs)
+        
+        Returns:
+            List of sentiment dictionaries (same order as texts)
+        '''
+        if not texts:
+            return []
+        
+        if inference_client.enabled:
+            try:
+                model_id = await inference_client.model_id()
+                return await self._score_cached(
+                    texts, model_id, functools.partial(inference_client.score, priority=priority)
+                )
+            except ConnectionError as e:
+                print(f' Inference server unavailable, scoring in-process: {e}')
+        
+        if not self.model_loaded and self.backend != 'rules':
+            if self._loading is None or self._loading.done():
+                self._loading = asyncio.ensure_future(
+                    inference_executor.run(self.load_model, timeout=settings.model_load_timeout_seconds)
+                )
+            # Concurrent cold-start requests share one load instead of each queueing their own
+            await asyncio.shield(self._loading)
+        
+        # Lexicon scoring is cheaper than a cache round trip
+        if not self.model_loaded:
+            return rule_sentiment.score_batch(texts)
+        
+        return await self._score_cached(
+            texts, self.model_id, functools.partial(self.batcher.submit, priority=priority)
+        )
+
+    async def analyze_articles(self, articles: List[Dict], include_summaries: bool = False,
+                               token_budget: Optional[int] = None,
+                               priority: str = DEFAULT_PRIORITY) -> List[Dict]:
+        '''
+        Score articles by headline and, optionally, by summary.
+
+        Summaries are cut into headline-sized windows (summary_chunk_words)
+        and every window of every article is scored in the same
+        analyze_batch_cached call as the headlines, so they share batches
+        and the cache. Windows are taken round-robin across articles until
+        the request's token budget (whitespace tokens) is spent. Headlines
+        are always scored and their words count against the budget first,
+        so the budget only limits summary windows.
+
+        Args:
+            articles: Articles with 'headline' and optional 'summary'
+            include_summaries: Also score summary text
+            token_budget: Override for summary_token_budget (summary windows only)
+            priority: Inference queue class (see analyze_batch_cached)
+
+        Returns:
+            One pooled sentiment dictionary per article (same order), with
+            'chunks' = number of texts that went into it
+        '''
+        headlines = [article['headline'] for article in articles]
+        if not include_summaries:
+            return await self.analyze_batch_cached(headlines, priority)
+
+        budget = settings.summary_token_budget if token_budget is None else token_budget
+        texts, owners = list(headlines), list(range(len(articles)))
+        budget -= sum(len(headline.split()) for headline in headlines)
+
+        windows = [
+            _summary_windows(article.get('summary', ''), article['headline'], settings.summary_chunk_words)
+            for article in articles
+        ]
+        depth = 0
+        while budget > 0 and any(depth < len(w) for w in windows):
+            for i, article_windows in enumerate(windows):
+                if depth >= len(article_windows):
+                    continue
+                cost = len(article_windows[depth].split())
+                if cost > budget:
+                    budget = 0
+                    break
+                texts.append(article_windows[depth])
+                owners.append(i)
+                budget -= cost
+            depth += 1
+
+        results = await self.analyze_batch_cached(texts, priority)
+
+        grouped = [[] for _ in articles]
+        for owner, result in zip(owners, results):
+            grouped[owner].append(result)
+        return [self._pool(headline, chunk_results) for headline, chunk_results in zip(headlines, grouped)]
+
+    def _pool(self, headline: str, results: List[Dict]) -> Dict:
+        '''Confidence-weighted pooling of one article's headline and summary windows.'''
+        if len(results) == 1:
+            return {**results[0], 'chunks': 1}
+
+        weights = np.array([r.get('confidence', 0.5) for r in results])
+        if weights.sum() <= 0:
+            weights = np.ones(len(results))
+
+        if all('probabilities' in r for r in results):
+            probs = np.array([[r['probabilities'][label] for label in LABEL_INDEX] for r in results])
+            result = self._build_result(headline, weights @ probs / weights.sum())
         else:
-            sentiment = 'neutral'
+            # Rule-based results carry no probabilities; pool the scores
+            score = float(np.array([r.get('score', 0.0) for r in results]) @ weights / weights.sum())
+            result = {
+                'text': headline[:100],
+                'sentiment': self.overall_label(score),
+                'score': round(score, 3),
+                'confidence': round(float(weights.mean()), 3),
+                'method': 'rule-based'
+            }
+        result['chunks'] = len(results)
+        return result
+
+    async def _score_cached(self, texts: List[str], model_id: str, score) -> List[Dict]:
+        '''Serve texts from the sentiment cache and score the misses with score(texts).'''
+        digests = [headline_digest(text, model_id) for text in texts]
+        cached = await sentiment_cache.get_many(list(dict.fromkeys(digests)))
+        
+        # Score each distinct missing headline once
+        missing = {}
+        for text, digest in zip(texts, digests):
+            if digest not in cached and digest not in missing:
+                missing[digest] = text
+        
+        scored = {}
+        if missing:
+            # Headlines scored before a restart or cache eviction
+            stored = await sentiment_history.lookup(missing, model_id)
+            if stored:
+                await sentiment_cache.set_many(stored)
+                cached.update(stored)
+                missing = {digest: text for digest, text in missing.items() if digest not in stored}
+        
+        if missing:
+            # Misses from all in-flight requests share forward passes
+            fresh = await score(list(missing.values()))
+            scored = dict(zip(missing.keys(), fresh))
+            
+            # Don't memoize per-text rule-based fallbacks under the model's key
+            await sentiment_cache.set_many({
+                digest: result for digest, result in scored.items()
+                if model_id == 'rule-based' or result.get('method') != 'rule-based'
+            })
+        
+        results = []
+        for text, digest in zip(texts, digests):
+            result = dict(cached.get(digest) or scored[digest])
+            result['text'] = text[:100]
+            # Which model produced it (SentimentHistory rows are per model)
+            result['model_id'] = 'rule-based' if result.get('method') == 'rule-based' else model_id
+            results.append(result)
+        
+        return results
+    
+    def _tokenize(self, texts: List[str]) -> Dict[str, List[List[int]]]:
+        '''Tokenize without padding, truncated to sentiment_max_length.'''
+        return dict(self.tokenizer(
+            texts,
+            truncation=True,
+            max_length=settings.sentiment_max_length
+        ))
+    
+    def _predict_probs(self, texts: List[str]) -> np.ndarray:
+        '''Tokenize and score texts in one forward pass (n x 3 probabilities).'''
+        if self.backend == 'student':
+            return self.model.predict_proba(texts)
+        return self._forward(self._tokenize(texts))
+    
+    def _forward(self, features: Dict[str, List[List[int]]]) -> np.ndarray:
+        '''Pad features to their longest row, run one forward pass, return probabilities.'''
+        inputs = self.tokenizer.pad(
+            features,
+            padding=True,
+            return_tensors='np' if self.backend == 'onnx' else 'pt'
+        )
+        
+        if self.backend == 'onnx':
+            logits = self.model(inputs)
+            exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+            return exp / exp.sum(axis=-1, keepdims=True)
+        
+        import torch
+        
+        # Get prediction
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
+        
+        return predictions.numpy()
+    
+    def _build_result(self, text: str, probs: np.ndarray) -> Dict:
+        '''Turn one row of class probabilities into a sentiment dictionary.'''
+        # Get predicted class
+        predicted_class = int(np.argmax(probs))
+        sentiment_label = self.labels[predicted_class]
+        confidence = float(probs[predicted_class])
+        
+        # Convert to score: -1 (negative) to +1 (positive)
+        # Adjust score by confidence
+        # e.g., if neutral with 60% confidence, score closer to 0
+        if sentiment_label == 'neutral':
             score = 0.0
+        elif sentiment_label == 'positive':
+            score = confidence  # 0.5 to 1.0
+        else:  # negative
+            score = -confidence  # -1.0 to -0.5
         
         return {
-            'text': text[:100],
-            'sentiment': sentiment,
+            'text': text[:100],  # First 100 chars
+            'sentiment': sentiment_label,
             'score': round(score, 3),
-            'confidence': 0.5,  # Lower confidence for rule-based
-            'method': 'rule-based'
+            'confidence': round(confidence, 3),
+            'probabilities': {
+                'negative': round(float(probs[0]), 3),
+                'neutral': round(float(probs[1]), 3),
+                'positive': round(float(probs[2]), 3)
+            }
         }
     
+    def _rule_based_sentiment(self, text: str) -> Dict:
+        '''
+        Simple rule-based sentiment (fallback when model unavailable).
+        '''
+        return rule_sentiment.score(text)
+    
     def aggregate_sentiment(self, sentiments: List[Dict]) -> Dict:
         '''
         Aggregate multiple sentiments into overall score.
@@ -196,33 +591,82 @@ class SentimentService:
                 'article_count': 0
             }
         
+        # One pass over the dicts into arrays, then vectorized math
+        count = len(sentiments)
+        scores = np.empty(count)
+        weights = np.empty(count)
+        labels = np.empty(count, dtype=np.intp)
+        for i, sent in enumerate(sentiments):
+            scores[i] = sent.get('score', 0.0)
+            weights[i] = sent.get('confidence', 0.5)
+            labels[i] = LABEL_INDEX.get(sent['sentiment'], UNKNOWN_LABEL)
+        
         # Weighted average by confidence
-        total_weight = 0
-        weighted_sum = 0
+        total_weight = weights.sum()
+        avg_score = float(scores @ weights / total_weight) if total_weight > 0 else 0.0
+        counts = np.bincount(labels, minlength=UNKNOWN_LABEL + 1)
+        
+        return self._summarize(avg_score, count, counts)
+    
+    def aggregate_grouped(self, ticker_ids, scores, confidences, labels) -> Dict[str, Dict]:
+        '''
+        Aggregate sentiments for many tickers at once (e.g. a whole scan).
+        Every row counts, so a headline listed twice for a ticker is
+        counted twice; callers pass each ticker's headlines once.
         
-        for sent in sentiments:
-            weight = sent.get('confidence', 0.5)
-            score = sent.get('score', 0.0)
-            weighted_sum += score * weight
-            total_weight += weight
+        Args:
+            ticker_ids: Ticker of each scored headline
+            scores: Sentiment score of each headline
+            confidences: Confidence of each headline (aggregation weight)
+            labels: 'positive'/'negative'/'neutral' of each headline
+        
+        Returns:
+            Dictionary mapping ticker -> aggregated sentiment (same shape
+            as aggregate_sentiment)
+        '''
+        if len(ticker_ids) == 0:
+            return {}
         
-        avg_score = weighted_sum / total_weight if total_weight > 0 else 0.0
+        tickers, group = np.unique(np.asarray(ticker_ids), return_inverse=True)
+        scores = np.asarray(scores, dtype=float)
+        weights = np.asarray(confidences, dtype=float)
+        codes = np.array([LABEL_INDEX.get(label, UNKNOWN_LABEL) for label in labels], dtype=np.intp)
         
-        # Determine overall sentiment
+        groups = len(tickers)
+        buckets = UNKNOWN_LABEL + 1
+        weighted_sum = np.bincount(group, weights=scores * weights, minlength=groups)
+        total_weight = np.bincount(group, weights=weights, minlength=groups)
+        sizes = np.bincount(group, minlength=groups)
+        counts = np.bincount(group * buckets + codes, minlength=groups * buckets).reshape(groups, buckets)
+        
+        avg_scores = np.divide(
+            weighted_sum, total_weight,
+            out=np.zeros(groups), where=total_weight > 0
+        )
+        
+        return {
+            str(ticker): self._summarize(float(avg_scores[g]), int(sizes[g]), counts[g])
+            for g, ticker in enumerate(tickers)
+        }
+    
+    @staticmethod
+    def overall_label(avg_score: float) -> str:
+        '''Map an aggregate score to an overall sentiment label.'''
         if avg_score > 0.2:
-            overall = 'positive'
+            return 'positive'
         elif avg_score < -0.2:
-            overall = 'negative'
-        else:
-            overall = 'neutral'
-        
+            return 'negative'
+        return 'neutral'
+    
+    def _summarize(self, avg_score: float, article_count: int, counts: np.ndarray) -> Dict:
+        '''Build the aggregate dict from an average score and per-label counts.'''
         return {
-            'overall_sentiment': overall,
+            'overall_sentiment': self.overall_label(avg_score),
             'overall_score': round(avg_score, 3),
-            'article_count': len(sentiments),
-            'positive_count': sum(1 for s in sentiments if s['sentiment'] == 'positive'),
-            'negative_count': sum(1 for s in sentiments if s['sentiment'] == 'negative'),
-            'neutral_count': sum(1 for s in sentiments if s['sentiment'] == 'neutral')
+            'article_count': article_count,
+            'positive_count': int(counts[LABEL_INDEX['positive']]),
+            'negative_count': int(counts[LABEL_INDEX['negative']]),
+            'neutral_count': int(counts[LABEL_INDEX['neutral']])
         }
 
 # Singleton instance
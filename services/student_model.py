@@ -0,0 +1,89 @@
+"""
+Student sentiment model.
+
+A linear softmax classifier over hashed word 1-2 grams, distilled from
+FinBERT's probabilities on our own headlines (see scripts/distill_student.py).
+Scoring a headline is a sparse dot product, so it is orders of magnitude
+cheaper than a transformer forward pass and needs no torch at all.
+Loaded by SentimentService when sentiment_backend='student'.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+N_FEATURES = 2 ** 18
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class StudentModel:
+    """Hashed n-gram linear classifier trained on soft teacher labels."""
+
+    def __init__(self, n_features: int = N_FEATURES, ngram_max: int = 2):
+        self.n_features = n_features
+        self.ngram_max = ngram_max
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, ngram_max),
+            alternate_sign=False,
+            norm='l2'
+        )
+        self.weights = np.zeros((n_features, 3), dtype=np.float32)
+        self.bias = np.zeros(3, dtype=np.float32)
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        '''Class probabilities (n x 3, same label order as SentimentService).'''
+        features = self.vectorizer.transform(texts)
+        return _softmax(features @ self.weights + self.bias)
+
+    def fit(self, texts: List[str], teacher_probs: np.ndarray, epochs: int = 10,
+            learning_rate: float = 2.0, l2: float = 1e-6, batch_size: int = 256,
+            seed: int = 0) -> Dict:
+        '''
+        Minibatch SGD on cross-entropy against the teacher's soft labels.
+
+        Returns:
+            Final training loss per epoch
+        '''
+        features = self.vectorizer.transform(texts).tocsr()
+        targets = np.asarray(teacher_probs, dtype=np.float32)
+        rng = np.random.default_rng(seed)
+        losses = []
+
+        for _ in range(epochs):
+            order = rng.permutation(features.shape[0])
+            epoch_loss = 0.0
+            for start in range(0, len(order), batch_size):
+                rows = order[start:start + batch_size]
+                x, q = features[rows], targets[rows]
+                p = _softmax(x @ self.weights + self.bias)
+
+                epoch_loss += float(-(q * np.log(p + 1e-9)).sum())
+                grad = (p - q) / len(rows)
+                self.weights -= learning_rate * (np.asarray(x.T @ grad) + l2 * self.weights)
+                self.bias -= learning_rate * grad.sum(axis=0)
+            losses.append(round(epoch_loss / len(order), 4))
+
+        return {'loss_per_epoch': losses}
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            weights=self.weights,
+            bias=self.bias,
+            n_features=self.n_features,
+            ngram_max=self.ngram_max
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'StudentModel':
+        data = np.load(path)
+        model = cls(n_features=int(data['n_features']), ngram_max=int(data['ngram_max']))
+        model.weights = data['weights']
+        model.bias = data['bias']
+        return model
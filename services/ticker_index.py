@@ -0,0 +1,150 @@
+"""
+Ticker Mention Index
+
+Inverted index from ticker to the news entries that mention it.
+
+Each entry is tokenized once into a set of mention keys:
+- 'S:AAPL'  bare upper-case token (symbols are never matched in lowercase)
+- 'C:ON'    cashtag ($ON) or exchange-qualified (NASDAQ: ON) symbol
+- 'N:apple' lower-cased word n-gram, for company-name aliases
+
+Every tracked ticker maps its own keys to itself, so matching an entry
+is one hash lookup per key, whether 10 or 10,000 tickers are tracked
+(the same flat cost as a multi-pattern automaton, without a dependency).
+Symbols of one or two letters and symbols that are ordinary words ('A',
+'ON', 'IT', 'ALL') only match as cashtags or exchange-qualified.
+"""
+
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+from services.sentiment_cache import content_hash
+from utils.tickers import COMPANY_ALIASES, COMMON_WORD_TICKERS
+
+# Longest alias n-gram considered ('Bank of America')
+MAX_ALIAS_WORDS = 3
+
+TOKEN_PATTERN = re.compile(r'\$?[A-Za-z][A-Za-z0-9]*(?:[.&-][A-Za-z0-9]+)*')
+EXCHANGE_PATTERN = re.compile(r'\b(?:NYSE|NASDAQ|Nasdaq|AMEX|NYSEARCA|OTC)\s*:\s*([A-Za-z][A-Za-z0-9.]*)')
+
+
+def mention_keys(text: str, max_words: int = MAX_ALIAS_WORDS) -> Set[str]:
+    '''Tokenize text once into the keys tickers are matched against.'''
+    keys = {f'C:{symbol.upper()}' for symbol in EXCHANGE_PATTERN.findall(text)}
+    words = []
+    for token in TOKEN_PATTERN.findall(text):
+        if token.startswith('$'):
+            keys.add(f'C:{token[1:].upper()}')
+            token = token[1:]
+        elif token.isupper():
+            keys.add(f'S:{token}')
+        words.append(token.lower())
+
+    for size in range(1, max_words + 1):
+        for i in range(len(words) - size + 1):
+            keys.add('N:' + ' '.join(words[i:i + size]))
+    return keys
+
+
+def entry_id(feed_url: str, entry: Dict) -> str:
+    '''Stable id of a feed entry (same story in the next refresh, same id).'''
+    return content_hash(f"{feed_url}\n{entry.get('link') or entry.get('title', '')}")
+
+
+class TickerIndex:
+    """Ticker -> entry ids, over the entries of the current feed snapshots."""
+
+    def __init__(self, aliases: Dict[str, List[str]] = COMPANY_ALIASES,
+                 common_words: Iterable[str] = COMMON_WORD_TICKERS):
+        self.aliases = {ticker.upper(): names for ticker, names in aliases.items()}
+        self.common_words = set(common_words)
+
+        self._matcher: Dict[str, Set[str]] = {}  # mention key -> tickers
+        self._universe: Set[str] = set()
+        self._entries: Dict[str, Tuple[str, Dict]] = {}  # id -> (source, entry)
+        self._entry_keys: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Dict[str, None]] = {}  # ticker -> ordered set of ids
+        self._by_feed: Dict[str, List[str]] = {}
+
+        self.add_tickers(self.aliases)
+
+    def _ticker_keys(self, ticker: str) -> Set[str]:
+        keys = {f'C:{ticker}'}
+        if len(ticker) > 2 and ticker not in self.common_words:
+            keys.add(f'S:{ticker}')
+        for name in self.aliases.get(ticker, []):
+            words = [token.lstrip('$').lower() for token in TOKEN_PATTERN.findall(name)]
+            if 0 < len(words) <= MAX_ALIAS_WORDS:
+                keys.add('N:' + ' '.join(words))
+        return keys
+
+    def add_tickers(self, tickers: Iterable[str]) -> int:
+        '''
+        Track more tickers; entries already indexed are matched against
+        the new ones only. Returns the number of tickers added.
+        '''
+        new = {ticker.upper() for ticker in tickers} - self._universe
+        for ticker in new:
+            keys = self._ticker_keys(ticker)
+            for key in keys:
+                self._matcher.setdefault(key, set()).add(ticker)
+            postings = self._postings.setdefault(ticker, {})
+            for eid, entry_keys in self._entry_keys.items():
+                if not keys.isdisjoint(entry_keys):
+                    postings[eid] = None
+        self._universe |= new
+        return len(new)
+
+    def match(self, keys: Set[str]) -> Set[str]:
+        '''Tickers mentioned by an entry with these mention keys.'''
+        tickers = set()
+        for key in keys:
+            found = self._matcher.get(key)
+            if found:
+                tickers |= found
+        return tickers
+
+    def replace_feed(self, feed_url: str, source: str, entries: List[Dict]):
+        '''
+        Make a feed's indexed entries match its current snapshot. Only
+        entries not indexed yet are matched; entries that dropped out of
+        the feed are removed. Entries carry precomputed 'mention_keys'.
+        '''
+        current = {entry_id(feed_url, entry): entry for entry in entries}
+        previous = self._by_feed.get(feed_url, [])
+        self._remove([eid for eid in previous if eid not in current])
+
+        for eid, entry in current.items():
+            if eid in self._entries:
+                self._entries[eid] = (source, entry)
+                continue
+            keys = entry.get('mention_keys')
+            if keys is None:
+                keys = mention_keys(f"{entry.get('title', '')} {entry.get('summary', '')}")
+            self._entries[eid] = (source, entry)
+            self._entry_keys[eid] = keys
+            for ticker in self.match(keys):
+                self._postings[ticker][eid] = None
+        self._by_feed[feed_url] = list(current)
+
+    def remove_feed(self, feed_url: str):
+        self._remove(self._by_feed.pop(feed_url, []))
+
+    def _remove(self, ids: List[str]):
+        for eid in ids:
+            self._entries.pop(eid, None)
+            for ticker in self.match(self._entry_keys.pop(eid, set())):
+                self._postings[ticker].pop(eid, None)
+
+    def lookup(self, ticker: str) -> List[Tuple[str, Dict]]:
+        '''(source, entry) for every indexed entry that mentions ticker.'''
+        ids = self._postings.get(ticker.upper(), {})
+        return [self._entries[eid] for eid in ids]
+
+    def stats(self) -> Dict:
+        return {
+            'tickers': len(self._universe),
+            'entries': len(self._entries),
+            'feeds': len(self._by_feed),
+            'postings': sum(len(ids) for ids in self._postings.values())
+        }
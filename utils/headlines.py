@@ -0,0 +1,49 @@
+"""
+Sample financial headlines.
+
+A fixed, offline set of typical headlines used for backend parity checks,
+model warmup and benchmarks.
+"""
+
+SAMPLE_HEADLINES = [
+    'Apple reports record quarterly earnings, beats analyst estimates',
+    'Tesla shares fall after disappointing delivery numbers',
+    'Microsoft announces $10 billion investment in AI startup',
+    'Amazon faces antitrust lawsuit from FTC',
+    'NVIDIA stock surges on strong data center demand',
+    'Meta cuts 10,000 jobs in second round of layoffs',
+    'JPMorgan raises full-year net interest income forecast',
+    'Google parent Alphabet misses revenue expectations',
+    'Fed holds rates steady, signals possible cuts later this year',
+    'Oil prices drop as OPEC output rises',
+    'Boeing halts deliveries after new quality issue found',
+    'Netflix subscriber growth exceeds expectations',
+    'Intel downgraded to underperform on weak PC outlook',
+    'Pfizer wins FDA approval for new RSV vaccine',
+    'Bank shares tumble amid regional lender concerns',
+    'Walmart raises annual profit guidance on strong grocery sales',
+    'Disney to restructure into three divisions',
+    'Coinbase shares slide after SEC lawsuit',
+    'AMD unveils new chips to compete with NVIDIA',
+    'Ford recalls 500,000 vehicles over brake defect',
+    'Starbucks same-store sales rise 11% in China',
+    'Goldman Sachs profit falls 58% on trading slump',
+    'Visa and Mastercard settle fee lawsuit with merchants',
+    'Salesforce shares jump after activist investor takes stake',
+    'Nike warns of slowing demand, stock drops',
+    'Berkshire Hathaway reports operating earnings in line with forecast',
+    'Uber posts first annual profit as a public company',
+    'Silicon Valley Bank collapses in largest failure since 2008',
+    'S&P 500 closes flat ahead of inflation data',
+    'Exxon Mobil announces $60 billion acquisition of Pioneer',
+    'AT&T adds more wireless subscribers than expected',
+    'Zoom revenue growth slows to single digits',
+    'Costco monthly sales beat estimates',
+    'Credit Suisse shares hit record low',
+    'Chevron to buy Hess in $53 billion deal',
+    'Snap shares plunge on weak ad revenue guidance',
+    'Treasury yields climb to 16-year high',
+    'Moderna cuts sales forecast for COVID vaccine',
+    'PayPal names new CEO, shares unchanged',
+    'Airline stocks rally as travel demand stays strong',
+]
@@ -0,0 +1,56 @@
+"""
+Ticker universe for news matching.
+
+Company-name aliases per ticker, including the short names headlines use
+('Meta', 'Goldman'), match case-insensitively as whole words.
+
+Symbols that are also everyday words, and every symbol of one or two
+letters, only count as a mention when written as a cashtag ($ON) or
+exchange-qualified (NASDAQ: ON), never as a bare word.
+"""
+
+COMPANY_ALIASES = {
+    'AAPL': ['Apple'],
+    'MSFT': ['Microsoft'],
+    'GOOGL': ['Alphabet', 'Google'],
+    'GOOG': ['Alphabet', 'Google'],
+    'AMZN': ['Amazon'],
+    'META': ['Meta', 'Meta Platforms', 'Facebook'],
+    'NVDA': ['Nvidia'],
+    'TSLA': ['Tesla'],
+    'JPM': ['JPMorgan', 'JP Morgan', 'JPMorgan Chase'],
+    'BAC': ['Bank of America', 'BofA'],
+    'WFC': ['Wells Fargo'],
+    'GS': ['Goldman Sachs', 'Goldman'],
+    'MS': ['Morgan Stanley'],
+    'NFLX': ['Netflix'],
+    'AMD': ['Advanced Micro Devices'],
+    'INTC': ['Intel'],
+    'BA': ['Boeing'],
+    'XOM': ['Exxon', 'ExxonMobil', 'Exxon Mobil'],
+    'CVX': ['Chevron'],
+    'DIS': ['Disney', 'Walt Disney'],
+    'WMT': ['Walmart', 'Wal-Mart'],
+    'KO': ['Coca-Cola', 'Coca Cola'],
+    'PFE': ['Pfizer'],
+    'JNJ': ['Johnson & Johnson', 'J&J'],
+    'UNH': ['UnitedHealth', 'UnitedHealth Group'],
+    'V': ['Visa'],
+    'MA': ['Mastercard'],
+    'ORCL': ['Oracle'],
+    'CRM': ['Salesforce'],
+    'ADBE': ['Adobe'],
+    'UBER': ['Uber'],
+    'ON': ['onsemi', 'ON Semiconductor'],
+    'IT': ['Gartner'],
+    'A': ['Agilent'],
+    'SPY': [],
+    'QQQ': [],
+}
+
+# Symbols that collide with ordinary (upper-cased) English words
+COMMON_WORD_TICKERS = {
+    'ALL', 'ARE', 'BIG', 'CAR', 'CAT', 'DOC', 'EAT', 'FUN', 'GO', 'HAS',
+    'KEY', 'LOW', 'NOW', 'OPEN', 'PLAY', 'REAL', 'SEE', 'SO', 'TRUE',
+    'WELL', 'AI', 'CEO', 'USA', 'GDP', 'CPI', 'IPO', 'ETF', 'FED', 'SEC',
+}